@@ -0,0 +1,125 @@
+"""Benchmark decoding of reply bodies.
+
+Times the standard library and orjson decoders on the bundled objects.json
+and values.json fixtures, and how long the event loop is blocked when the
+client decodes a reply inline or hands it to the executor. The executor
+only shortens the stall as far as the decoder releases the GIL.
+
+Run from the repository root (Home Assistant must be importable):
+
+    python -m benchmarks.bench_decode --scale 10
+"""
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import statistics
+import time
+import timeit
+
+from custom_components.iungo.const import DECODE_EXECUTOR_BYTES
+from custom_components.iungo.iungo import IungoClient
+
+from .fake_iungo import load_fixtures, scale_fixtures
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FIXTURES = Path(__file__).resolve().parent.parent / "custom_components"
+
+
+def decoders() -> dict:
+    """Return the decoders available here by name."""
+    found = {"json": json.loads}
+    if orjson is not None:
+        found["orjson"] = orjson.loads
+    return found
+
+
+async def loop_block(client: IungoClient, body: bytes, number: int) -> list[float]:
+    """Return the longest event loop stall of each of number decodes.
+
+    A ticker measures how late it runs while the client decodes the body,
+    which is how long other tasks had to wait.
+    """
+    loop = asyncio.get_running_loop()
+    stalls = []
+    for _ in range(number):
+        longest = 0.0
+        running = True
+
+        async def tick() -> None:
+            nonlocal longest
+            while running:
+                started = loop.time()
+                await asyncio.sleep(0)
+                longest = max(longest, loop.time() - started)
+
+        ticker = asyncio.ensure_future(tick())
+        await asyncio.sleep(0)
+        await client._async_decode(body)
+        running = False
+        await ticker
+        stalls.append(longest)
+    return stalls
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Time the decoders and the event loop stalls."""
+    bodies = {
+        name: (FIXTURES / name).read_bytes()
+        for name in ("objects.json", "values.json")
+    }
+    if args.scale > 1:
+        fixtures = load_fixtures()
+        object_info, values = scale_fixtures(
+            fixtures["object_info"],
+            fixtures["objmgr_list_objects_props_values"],
+            args.scale,
+        )
+        bodies = {
+            "objects.json": json.dumps(object_info).encode(),
+            "values.json": json.dumps(values).encode(),
+        }
+    for name, body in bodies.items():
+        print(f"{name}: {len(body)} bytes")
+        for decoder_name, decoder in decoders().items():
+            seconds = timeit.timeit(lambda: decoder(body), number=args.number)
+            print(f"  {decoder_name:>7}: {seconds / args.number * 1e6:8.1f} us/decode")
+
+    loop = asyncio.get_running_loop()
+
+    async def executor(func, *call_args):
+        return await loop.run_in_executor(None, func, *call_args)
+
+    print(f"event loop stall per decode, executor from {DECODE_EXECUTOR_BYTES} bytes:")
+    for name, body in bodies.items():
+        for label, client in (
+            ("inline", IungoClient("bench")),
+            ("executor", IungoClient("bench", executor=executor)),
+        ):
+            stalls = await loop_block(client, body, args.number // 10 or 1)
+            started = time.perf_counter()
+            await client._async_decode(body)
+            print(
+                f"  {name:>12} {label:>8}: median "
+                f"{statistics.median(stalls) * 1e6:8.1f} us, "
+                f"max {max(stalls) * 1e6:8.1f} us, "
+                f"decode {(time.perf_counter() - started) * 1e6:8.1f} us"
+            )
+
+
+def main() -> None:
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1,
+                        help="copies of every object, e.g. 10 or 100")
+    parser.add_argument("--number", type=int, default=200)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""End-to-end poll benchmark against the fake Iungo box.
+
+Runs the real data and firmware coordinators and sensor entities of the
+integration against benchmarks.fake_iungo, and reports per poll latency,
+parse time and entity update cost.
+
+Run from the repository root (Home Assistant must be importable):
+
+    python -m benchmarks.bench_e2e --polls 50 --scale 10 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
+
+from custom_components.iungo import sensor
+from custom_components.iungo.const import CONF_HOST, STREAM_CHUNK_SIZE
+from custom_components.iungo.coordinator import (
+    IungoDataUpdateCoordinator,
+    IungoFirmwareUpdateCoordinator,
+)
+from custom_components.iungo.engine import IungoPollEngine
+from custom_components.iungo.iungo import IungoClient, ObjectValuesStreamParser
+
+from .fake_iungo import FakeIungo
+
+
+class BenchEntry:
+    """The parts of a config entry the coordinators and platforms use."""
+
+    def __init__(self, host: str) -> None:
+        self.entry_id = "bench"
+        self.title = host
+        self.data = {CONF_HOST: host}
+        self.options = {}
+        self.runtime_data = None
+
+    def async_create_background_task(self, hass, target, name):
+        """Run a background task on hass."""
+        return hass.async_create_background_task(target, name)
+
+    def async_on_unload(self, func) -> None:
+        """Nothing is unloaded in the benchmark."""
+
+
+def summarize(name: str, samples: list[float], unit: str = "ms") -> str:
+    """Format median, p95 and max of samples given in seconds."""
+    scale = 1000 if unit == "ms" else 1e6
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"{name:>18}: median {statistics.median(ordered) * scale:8.2f} {unit}"
+        f"  p95 {p95 * scale:8.2f} {unit}  max {ordered[-1] * scale:8.2f} {unit}"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Set up the integration against the fake box and poll it."""
+    box = FakeIungo(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        scale=args.scale,
+        selective=not args.no_selective,
+        seed=1,
+    )
+    host = await box.start()
+    hass = HomeAssistant(tempfile.mkdtemp())
+    entry = BenchEntry(host)
+    engine = IungoPollEngine()
+    engine.register(entry.entry_id)
+    client = IungoClient(
+        host,
+        shared_semaphore=engine.request_semaphore,
+        executor=hass.async_add_executor_job,
+    )
+    data = IungoDataUpdateCoordinator(hass, entry, client, engine)
+    firmware = IungoFirmwareUpdateCoordinator(hass, entry, client, engine)
+
+    started = time.perf_counter()
+    for attempt in range(10):
+        try:
+            await data.async_initialize()
+            break
+        except ConfigEntryNotReady:
+            if attempt == 9:
+                raise
+    await data.async_refresh()
+    await firmware.async_refresh()
+    setup_time = time.perf_counter() - started
+    entry.runtime_data = type(
+        "RuntimeData", (), {"data": data, "firmware": firmware, "client": client})
+
+    entities = []
+    await sensor.async_setup_entry(hass, entry, entities.extend)
+    writes = 0
+
+    def count_write() -> None:
+        nonlocal writes
+        writes += 1
+
+    for entity in entities:
+        entity.hass = hass
+        entity.async_write_ha_state = count_write
+        if isinstance(entity, sensor.IungoSensor):
+            data.async_register_value_keys(entity._value_keys)
+        if entity.coordinator is data:
+            # What CoordinatorEntity.async_added_to_hass does
+            data.async_add_listener(
+                entity._handle_coordinator_update, entity.coordinator_context)
+
+    poll_times, parse_times, update_times = [], [], []
+    failures = 0
+    requests_before = box.requests
+    for _ in range(args.polls):
+        updates_before = data.metrics.entity_update_ms.as_dict()["samples"]
+        started = time.perf_counter()
+        await data.async_refresh()
+        poll_times.append(time.perf_counter() - started)
+        if not data.last_update_success:
+            failures += 1
+        if data.metrics.entity_update_ms.as_dict()["samples"] != updates_before:
+            update_times.append(data.metrics.entity_update_ms.last / 1000)
+
+    body = json.dumps(box.replies["objmgr_list_objects_props_values"]).encode()
+    for _ in range(args.polls):
+        started = time.perf_counter()
+        parser = ObjectValuesStreamParser()
+        for start in range(0, len(body), STREAM_CHUNK_SIZE):
+            parser.feed(body[start:start + STREAM_CHUNK_SIZE])
+        parser.close()
+        parse_times.append(time.perf_counter() - started)
+
+    print(f"objects: {len(box.objects)}, entities: {len(entities)}, "
+          f"payload: {len(body)} bytes")
+    print(f"setup: {setup_time * 1000:.1f} ms, polls: {args.polls}, "
+          f"failed: {failures}, requests: {box.requests - requests_before}, "
+          f"state writes: {writes}")
+    print(summarize("poll latency", poll_times))
+    print(summarize("parse", parse_times))
+    if update_times:
+        print(summarize("entity updates", update_times))
+
+    await client.async_close()
+    await box.stop()
+    await hass.async_stop(force=True)
+
+
+def main() -> None:
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=50)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--no-selective", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark parsing of the objmgr_list_objects_props_values reply.
+
+Compares decoding the whole document and walking it with
+parse_object_values against the streaming ObjectValuesStreamParser, using
+the bundled values.json fixture.
+
+Run from the repository root (Home Assistant must be importable):
+
+    python -m benchmarks.bench_parse
+"""
+
+import argparse
+import json
+from pathlib import Path
+import timeit
+import tracemalloc
+
+from custom_components.iungo.const import STREAM_CHUNK_SIZE
+from custom_components.iungo.iungo import (
+    ObjectValuesStreamParser,
+    parse_object_values,
+)
+
+FIXTURES = Path(__file__).resolve().parent.parent / "custom_components"
+
+
+def parse_full(raw: bytes) -> dict:
+    """Decode the whole reply, then build the lookup."""
+    return parse_object_values(json.loads(raw).get("rv", {}))
+
+
+def parse_stream(raw: bytes, chunk_size: int = STREAM_CHUNK_SIZE) -> dict:
+    """Feed the reply to the streaming parser in network sized chunks."""
+    parser = ObjectValuesStreamParser()
+    for start in range(0, len(raw), chunk_size):
+        parser.feed(raw[start:start + chunk_size])
+    return parser.close()
+
+
+def peak_memory(func, raw: bytes) -> int:
+    """Return the peak traced allocation in bytes while running func."""
+    tracemalloc.start()
+    func(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--values", type=Path,
+                        default=FIXTURES / "values.json")
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+
+    raw = args.values.read_bytes()
+    if parse_full(raw) != parse_stream(raw):
+        raise SystemExit("Streaming parser result differs from full parse")
+
+    print(f"payload: {len(raw)} bytes")
+    for name, func in (("full", parse_full), ("stream", parse_stream)):
+        seconds = timeit.timeit(lambda: func(raw), number=args.number)
+        print(
+            f"{name:>6}: {seconds / args.number * 1e6:8.1f} us/parse, "
+            f"peak {peak_memory(func, raw) / 1024:7.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
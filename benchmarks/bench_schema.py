@@ -0,0 +1,94 @@
+"""Benchmark compiling object_info into the sensor schema.
+
+Times compile_sensor_schema on the bundled objects.json fixture and
+compares per-sensor metadata lookups through the schema index with
+resolving them from the unit maps every time. Also reports the memory the
+decoded object_info takes against the compiled schema kept instead.
+
+Run from the repository root (Home Assistant must be importable):
+
+    python -m benchmarks.bench_schema
+"""
+
+import argparse
+import json
+from pathlib import Path
+import timeit
+import tracemalloc
+
+from custom_components.iungo.schema import (
+    DEVICE_CLASS_MAP,
+    DISPLAY_PRECISION_MAP,
+    STATE_CLASS_MAP,
+    SensorSchema,
+    compile_sensor_schema,
+    normalize_unit,
+)
+
+FIXTURES = Path(__file__).resolve().parent.parent / "custom_components"
+
+
+def retained_memory(raw: bytes) -> tuple[int, int]:
+    """Return the bytes held by decoded object_info and by its schema."""
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    object_info = json.loads(raw).get("rv", {})
+    tree = tracemalloc.get_traced_memory()[0] - base
+    schema = compile_sensor_schema(object_info)
+    del object_info
+    compiled = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del schema
+    return tree, compiled
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=Path,
+                        default=FIXTURES / "objects.json")
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    object_info = json.loads(args.objects.read_bytes()).get("rv", {})
+    schema = compile_sensor_schema(object_info)
+    keys = list(schema.index)
+    print(f"objects: {len(object_info)}, sensors: {len(schema.descriptors)}")
+    if SensorSchema.from_dict(schema.as_dict()) != schema:
+        raise SystemExit("Stored schema differs from the compiled one")
+    tree, compiled = retained_memory(args.objects.read_bytes())
+    print(f"retained: object_info {tree / 1024:.1f} KiB, schema "
+          f"{compiled / 1024:.1f} KiB, saved {(tree - compiled) / 1024:.1f} KiB")
+
+    def compile_cold():
+        normalize_unit.cache_clear()
+        compile_sensor_schema(object_info)
+
+    def lookup_maps():
+        for descriptor in schema.descriptors:
+            unit = normalize_unit.__wrapped__(descriptor.unit)
+            DEVICE_CLASS_MAP.get(unit)
+            STATE_CLASS_MAP.get(unit)
+            DISPLAY_PRECISION_MAP.get(unit, 2)
+
+    def lookup_index():
+        index = schema.index
+        for key in keys:
+            descriptor = index[key]
+            descriptor.device_class
+            descriptor.state_class
+            descriptor.display_precision
+
+    for name, func in (
+        ("compile (cold unit cache)", compile_cold),
+        ("compile (warm unit cache)",
+         lambda: compile_sensor_schema(object_info)),
+        ("metadata via unit maps", lookup_maps),
+        ("metadata via schema index", lookup_index),
+    ):
+        seconds = timeit.timeit(func, number=args.number)
+        print(f"{name:>26}: {seconds / args.number * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
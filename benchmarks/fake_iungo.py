@@ -0,0 +1,267 @@
+"""Fake Iungo box serving the bundled fixtures.
+
+Serves every /iungo/api_request/* endpoint the integration uses from the
+fixture JSON files, with configurable latency, jitter, error rate, value
+mutation on every poll or on a fixed refresh cadence and synthetic
+scaling to more objects.
+
+Run standalone (aiohttp must be importable):
+
+    python -m benchmarks.fake_iungo --port 8080 --latency 0.05 --scale 10
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+from pathlib import Path
+import random
+import time
+
+from aiohttp import web
+
+FIXTURES = Path(__file__).resolve().parent.parent / "custom_components"
+
+FIXTURE_FILES = {
+    "object_info": "objects.json",
+    "objmgr_list_objects_props_values": "values.json",
+    "sysinfo_version": "sysinfo.json",
+    "sysinfo_hw_revision": "hwinfo.json",
+    "fw_get_remote_info": "lastest_version.json",
+}
+
+# Props that move on every mutation: live power and flow readings
+LIVE_PROPS = frozenset(
+    {"usage", "solar", "power", "flow", "gas_usage", "voltage", "temp_current"})
+# Counters that only ever increase
+COUNTER_PROPS = frozenset(
+    {"T1", "T2", "-T1", "-T2", "gas", "import", "export", "pulstotal"})
+
+
+def load_fixtures(directory: Path = FIXTURES) -> dict:
+    """Load the fixture replies keyed by API request name."""
+    return {
+        name: json.loads((directory / filename).read_bytes())
+        for name, filename in FIXTURE_FILES.items()
+    }
+
+
+def _scaled_oid(oid: str, copy_index: int) -> str:
+    """Return the object id of a synthetic copy of an object."""
+    return oid if copy_index == 0 else f"{oid}{copy_index:04x}"
+
+
+def scale_fixtures(object_info: dict, values: dict, factor: int) -> tuple[dict, dict]:
+    """Return object_info and values replies with factor copies of every object.
+
+    Copies get derived object ids, so a factor of 10 turns the 19 fixture
+    objects into 190.
+    """
+    if factor <= 1:
+        return object_info, values
+    scaled_info = dict(object_info, rv={})
+    scaled_values = dict(values, rv=dict(values["rv"], objects=[]))
+    for copy_index in range(factor):
+        for oid, obj in object_info["rv"].items():
+            scaled_info["rv"][_scaled_oid(oid, copy_index)] = obj
+        for obj in values["rv"]["objects"]:
+            scaled_values["rv"]["objects"].append(
+                dict(obj, oid=_scaled_oid(obj["oid"], copy_index),
+                     propsval=copy.deepcopy(obj["propsval"])))
+    return scaled_info, scaled_values
+
+
+class FakeIungo:
+    """aiohttp application imitating an Iungo box."""
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        mutate: bool = True,
+        scale: int = 1,
+        selective: bool = True,
+        seed: int | None = None,
+        fixtures: dict | None = None,
+        etags: bool = False,
+        refresh_interval: float | None = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.mutate = mutate
+        self.selective = selective
+        # Send ETags with object info and firmware info and answer 304
+        self.etags = etags
+        # Seconds between value refreshes, like a meter sending telegrams;
+        # None refreshes the values on every values request.
+        self.refresh_interval = refresh_interval
+        self._refreshed = time.monotonic()
+        self.random = random.Random(seed)
+        self.replies = fixtures or load_fixtures()
+        object_info, values = scale_fixtures(
+            self.replies["object_info"],
+            self.replies["objmgr_list_objects_props_values"],
+            scale,
+        )
+        self.replies["object_info"] = object_info
+        self.replies["objmgr_list_objects_props_values"] = values
+        self.objects = {obj["oid"]: obj for obj in values["rv"]["objects"]}
+        self.seq = 0
+        self.requests = 0
+        self.bytes_sent = 0
+        self._runner: web.AppRunner | None = None
+
+    def make_app(self) -> web.Application:
+        """Return the aiohttp application."""
+        app = web.Application()
+        app.router.add_get("/iungo/api_request/{name}", self._handle)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the host:port to configure."""
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"{host}:{port}"
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def mutate_values(self) -> None:
+        """Move live readings and advance counters, like a running box."""
+        for obj in self.objects.values():
+            for prop in obj["propsval"]:
+                value = prop.get("value")
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                if prop["id"] in LIVE_PROPS:
+                    prop["value"] = round(
+                        max(0, value * self.random.uniform(0.9, 1.1)), 3)
+                elif prop["id"] in COUNTER_PROPS:
+                    prop["value"] = round(
+                        value + self.random.uniform(0, 0.01), 3)
+
+    def _refresh_values(self) -> None:
+        """Mutate the values when a refresh is due."""
+        if self.refresh_interval is None:
+            self.mutate_values()
+            return
+        due = (time.monotonic() - self._refreshed) // self.refresh_interval
+        if due:
+            self._refreshed += due * self.refresh_interval
+            self.mutate_values()
+
+    def _envelope(self, rv, started: float) -> dict:
+        """Wrap a reply value in the envelope the box sends."""
+        self.seq += 1
+        return {
+            "ok": True,
+            "type": "response",
+            "time": time.perf_counter() - started,
+            "rv": rv,
+            "systime": int(time.time()),
+            "seq": self.seq,
+            "error": False,
+        }
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        """Serve one API request."""
+        started = time.perf_counter()
+        self.requests += 1
+        delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.random.random() < self.error_rate:
+            return web.Response(status=503, text="Service unavailable")
+
+        name = request.match_info["name"]
+        headers = None
+        if name == "object_list_props_values" and self.selective:
+            if self.mutate and self.refresh_interval is not None:
+                self._refresh_values()
+            obj = self.objects.get(request.query.get("oid"))
+            if obj is None:
+                reply = dict(self._envelope(None, started),
+                             ok=False, error="unknown object")
+            else:
+                reply = self._envelope(
+                    {"propsval": obj["propsval"]}, started)
+        elif name in self.replies:
+            if name == "objmgr_list_objects_props_values" and self.mutate:
+                self._refresh_values()
+            reply = dict(self.replies[name])
+            if self.etags and name in ("object_info", "fw_get_remote_info"):
+                etag = '"%x"' % (hash(json.dumps(reply.get("rv"))) & 0xFFFFFFFF)
+                if request.headers.get("If-None-Match") == etag:
+                    return web.Response(status=304, headers={"ETag": etag})
+                headers = {"ETag": etag}
+            reply.update(self._envelope(reply.get("rv"), started))
+        else:
+            return web.Response(status=404, text="Unknown request")
+
+        body = json.dumps(reply).encode()
+        self.bytes_sent += len(body)
+        return web.Response(
+            body=body, content_type="application/json", headers=headers)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Serve until interrupted."""
+    box = FakeIungo(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        mutate=not args.static,
+        scale=args.scale,
+        selective=not args.no_selective,
+        seed=args.seed,
+        etags=args.etags,
+        refresh_interval=args.refresh_interval,
+    )
+    host = await box.start(args.host, args.port)
+    print(f"Fake Iungo with {len(box.objects)} objects on http://{host}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await box.stop()
+
+
+def main() -> None:
+    """Parse the command line and serve."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds added to every reply")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="random extra seconds on top of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of requests answered with HTTP 503")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="serve this many copies of every object")
+    parser.add_argument("--static", action="store_true",
+                        help="do not change values between polls")
+    parser.add_argument("--no-selective", action="store_true",
+                        help="reject per object value requests")
+    parser.add_argument("--refresh-interval", type=float,
+                        help="refresh values this many seconds apart instead "
+                             "of on every poll")
+    parser.add_argument("--etags", action="store_true",
+                        help="send ETags with object and firmware info")
+    parser.add_argument("--seed", type=int)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
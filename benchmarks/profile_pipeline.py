@@ -0,0 +1,178 @@
+"""Profile the parsing and entity pipeline offline.
+
+Feeds the fixture files, or captured payloads, through schema extraction,
+sensor construction and a series of polls (parsing the values reply,
+diffing it, updating the value store and derived metrics and reading every
+sensor state), without a Home Assistant instance or a box. Reports
+throughput in polls per second, memory per poll and optionally a cProfile
+breakdown.
+
+Run from the repository root (Home Assistant must be importable):
+
+    python -m benchmarks.profile_pipeline --scale 10 --polls 200 --profile
+"""
+
+import argparse
+import cProfile
+import json
+from pathlib import Path
+import pstats
+import statistics
+import time
+import tracemalloc
+
+from custom_components.iungo import sensor
+from custom_components.iungo.const import STREAM_CHUNK_SIZE
+from custom_components.iungo.derived import DerivedMetrics, compile_derived_metrics
+from custom_components.iungo.iungo import (
+    ObjectValuesStreamParser,
+    diff_object_values,
+    extract_sensors_from_object_info,
+    parse_object_values,
+)
+from custom_components.iungo.schema import compile_sensor_schema
+from custom_components.iungo.values import ValueStore
+
+from .fake_iungo import FakeIungo, load_fixtures
+
+
+class OfflineCoordinator:
+    """The parts of the data coordinator the sensors read, without hass."""
+
+    def __init__(self, schema) -> None:
+        self.schema = schema
+        self.values = ValueStore()
+        self.values.add_keys(schema.index, schema.value_types)
+        self.derived = DerivedMetrics()
+        self.derived.set_metrics(
+            compile_derived_metrics(schema, "profile"), self.async_value_slot)
+        self.data = None
+        self.changed_keys = None
+        self.history_stats = {}
+
+    def async_value_slot(self, key: tuple[str, str]) -> int:
+        """Return the value store slot of a pair."""
+        return self.values.slot(key, self.schema.value_types.get(key))
+
+
+def load_payloads(args: argparse.Namespace) -> dict:
+    """Return the fixture replies, or the captured ones given."""
+    fixtures = load_fixtures()
+    if args.objects:
+        fixtures["object_info"] = json.loads(args.objects.read_bytes())
+    if args.values:
+        fixtures["objmgr_list_objects_props_values"] = json.loads(
+            args.values.read_bytes())
+    return fixtures
+
+
+def parse_values(raw: bytes, stream: bool) -> dict:
+    """Parse a values reply like the client does."""
+    if not stream:
+        return parse_object_values(json.loads(raw).get("rv", {}))
+    parser = ObjectValuesStreamParser()
+    for start in range(0, len(raw), STREAM_CHUNK_SIZE):
+        parser.feed(raw[start:start + STREAM_CHUNK_SIZE])
+    return parser.close()
+
+
+def timed(func):
+    """Run func and return its result and the seconds it took."""
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def main() -> None:
+    """Run the profile."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--objects", type=Path,
+                        help="captured object_info reply")
+    parser.add_argument("--values", type=Path,
+                        help="captured objmgr_list_objects_props_values reply")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="copies of every object, e.g. 10 or 100")
+    parser.add_argument("--polls", type=int, default=100)
+    parser.add_argument("--full-parse", action="store_true",
+                        help="decode the whole reply instead of streaming it")
+    parser.add_argument("--profile", action="store_true",
+                        help="print a cProfile breakdown of the polls")
+    parser.add_argument("--top", type=int, default=20,
+                        help="functions shown in the cProfile breakdown")
+    args = parser.parse_args()
+
+    box = FakeIungo(scale=args.scale, seed=1, fixtures=load_payloads(args))
+    object_info = box.replies["object_info"].get("rv", {})
+
+    # Setup: what happens once per entry load
+    sensors_found, extract_seconds = timed(
+        lambda: extract_sensors_from_object_info(object_info))
+    schema, compile_seconds = timed(lambda: compile_sensor_schema(object_info))
+    coordinator = OfflineCoordinator(schema)
+    entities, construct_seconds = timed(lambda: sensor._create_object_sensors(
+        coordinator, schema.descriptors, "profile", set()))
+    print(f"objects: {len(object_info)}, sensors: {len(sensors_found)}, "
+          f"entities: {len(entities)}")
+    print(f"extract sensors: {extract_seconds * 1000:8.2f} ms")
+    print(f"compile schema:  {compile_seconds * 1000:8.2f} ms")
+    print(f"build entities:  {construct_seconds * 1000:8.2f} ms")
+
+    # Replies are serialized up front, so polls only time the integration
+    payloads = []
+    for _ in range(args.polls):
+        box.mutate_values()
+        payloads.append(
+            json.dumps(box.replies["objmgr_list_objects_props_values"]).encode())
+    stream = not args.full_parse
+
+    def poll(raw: bytes) -> None:
+        previous = coordinator.data["object_values"] if coordinator.data else None
+        object_values = parse_values(raw, stream)
+        coordinator.changed_keys = diff_object_values(previous, object_values)
+        coordinator.values.update(object_values, coordinator.changed_keys)
+        changed_results = coordinator.derived.evaluate(
+            coordinator.values, coordinator.changed_keys)
+        if coordinator.changed_keys is not None:
+            coordinator.changed_keys.update(changed_results)
+        coordinator.data = {"object_values": object_values}
+        for entity in entities:
+            entity.native_value
+            entity.extra_state_attributes
+
+    poll(payloads[0])
+    poll_times = []
+    for raw in payloads:
+        _, seconds = timed(lambda: poll(raw))
+        poll_times.append(seconds)
+
+    tracemalloc.start()
+    peaks = []
+    retained_before = tracemalloc.get_traced_memory()[0]
+    for raw in payloads[:min(len(payloads), 20)]:
+        tracemalloc.reset_peak()
+        start_size = tracemalloc.get_traced_memory()[0]
+        poll(raw)
+        peaks.append(tracemalloc.get_traced_memory()[1] - start_size)
+    retained = tracemalloc.get_traced_memory()[0] - retained_before
+    tracemalloc.stop()
+
+    total = sum(poll_times)
+    print(f"payload: {len(payloads[0])} bytes, polls: {len(payloads)}, "
+          f"{'full' if args.full_parse else 'streamed'} parse")
+    print(f"poll: median {statistics.median(poll_times) * 1000:8.2f} ms, "
+          f"max {max(poll_times) * 1000:8.2f} ms, "
+          f"{len(poll_times) / total:8.1f} polls/s")
+    print(f"memory per poll: peak {statistics.median(peaks) / 1024:8.1f} KiB, "
+          f"retained {retained / len(peaks) / 1024:8.1f} KiB")
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        for raw in payloads:
+            poll(raw)
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(args.top)
+
+
+if __name__ == "__main__":
+    main()
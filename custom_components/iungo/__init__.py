@@ -6,8 +6,12 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
-from .const import CONF_HOST, DOMAIN
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.storage import Store
+from .const import CONF_HOST, DOMAIN, STORAGE_KEY, STORAGE_VERSION
 from .coordinator import IungoDataUpdateCoordinator, IungoFirmwareUpdateCoordinator
+from .engine import async_get_poll_engine
+from .iungo import IungoClient
 
 
 PLATFORMS = [Platform.SENSOR, Platform.UPDATE]
@@ -19,6 +23,7 @@ class IungoRuntimeData:
 
     data: IungoDataUpdateCoordinator
     firmware: IungoFirmwareUpdateCoordinator
+    client: IungoClient
 
 
 IungoConfigEntry = ConfigEntry[IungoRuntimeData]
@@ -33,38 +38,77 @@ def _hub_configuration_url(host: str | None) -> str | None:
     return f"http://{host}"
 
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up a config entry for iungo."""
-    device_registry = dr.async_get(hass)
-    configuration_url = _hub_configuration_url(entry.data.get(CONF_HOST))
-    device_registry.async_get_or_create(
-        config_entry_id=entry.entry_id,
+def _hub_device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Return the device info of the hub device of a config entry."""
+    return DeviceInfo(
         identifiers={(DOMAIN, entry.entry_id)},
         name="Iungo Hub",
         manufacturer="Iungo",
         model="Iungo",
-        configuration_url=configuration_url,
+        configuration_url=_hub_configuration_url(entry.data.get(CONF_HOST)),
     )
 
-    data_coordinator = IungoDataUpdateCoordinator(hass, entry)
-    firmware_coordinator = IungoFirmwareUpdateCoordinator(hass, entry)
 
-    await data_coordinator.async_initialize()
-    await data_coordinator.async_config_entry_first_refresh()
-
-    await firmware_coordinator.async_config_entry_first_refresh()
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up a config entry for iungo."""
+    device_registry = dr.async_get(hass)
+    device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id, **_hub_device_info(entry))
+
+    engine = async_get_poll_engine(hass)
+    phase_offset = engine.register(entry.entry_id)
+    client = IungoClient(
+        entry.data[CONF_HOST],
+        shared_semaphore=engine.request_semaphore,
+        executor=hass.async_add_executor_job,
+    )
+    data_coordinator = IungoDataUpdateCoordinator(
+        hass, entry, client, engine, phase_offset)
+    firmware_coordinator = IungoFirmwareUpdateCoordinator(
+        hass, entry, client, engine, phase_offset)
+
+    try:
+        await data_coordinator.async_initialize()
+        if data_coordinator.object_info_cached:
+            # Entities can be created from the cached object info, so don't
+            # hold up setup when the box is slow or rebooting.
+            await data_coordinator.async_refresh()
+            await firmware_coordinator.async_refresh()
+        else:
+            await data_coordinator.async_config_entry_first_refresh()
+            await firmware_coordinator.async_config_entry_first_refresh()
+    except Exception:
+        engine.unregister(entry.entry_id)
+        await client.async_close()
+        raise
 
     entry.runtime_data = IungoRuntimeData(
         data=data_coordinator,
         firmware=firmware_coordinator,
+        client=client,
     )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    data_coordinator.async_update_sampling()
 
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options without reloading the entry."""
+    entry.runtime_data.data.apply_options()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        entry.runtime_data.data.engine.unregister(entry.entry_id)
+        await entry.runtime_data.client.async_close()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached object info of a deleted config entry."""
+    await Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id)).async_remove()
@@ -1,11 +1,29 @@
 """Config flow for Iungo integration."""
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import voluptuous as vol
 
 from .const import DOMAIN, CONF_HOST, DEFAULT_HOST
-from .iungo import async_validate_connection, CannotConnect
+from .const import CONF_MIN_UPDATE_INTERVAL, CONF_MAX_UPDATE_INTERVAL
+from .const import DEFAULT_MIN_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+from .const import CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL
+from .iungo import IungoClient, async_validate_connection, CannotConnect
+
+
+def _async_get_client(hass, host: str) -> IungoClient:
+    """Return the client of a loaded entry for the host, or a new one.
+
+    Sharing the client lets validation share fetches and the circuit
+    breaker state with the entry's polls.
+    """
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        runtime_data = getattr(entry, "runtime_data", None)
+        if runtime_data is not None and entry.data.get(CONF_HOST) == host:
+            return runtime_data.client
+    return IungoClient(
+        host, async_get_clientsession(hass), executor=hass.async_add_executor_job)
 
 
 class IungoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -13,14 +31,20 @@ class IungoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow handler."""
+        return IungoOptionsFlow()
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
 
         errors = {}
         if user_input is not None:
-            session = async_get_clientsession(self.hass)
+            client = _async_get_client(self.hass, user_input[CONF_HOST])
             try:
-                can_connect = await async_validate_connection(session, user_input[CONF_HOST])
+                can_connect = await async_validate_connection(client)
                 if not can_connect:
                     errors["base"] = "cannot_connect"
             except CannotConnect:
@@ -51,9 +75,9 @@ class IungoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         errors = {}
         if user_input is not None:
-            session = async_get_clientsession(self.hass)
+            client = _async_get_client(self.hass, user_input[CONF_HOST])
             try:
-                can_connect = await async_validate_connection(session, user_input[CONF_HOST])
+                can_connect = await async_validate_connection(client)
                 if not can_connect:
                     errors["base"] = "cannot_connect"
             except CannotConnect:
@@ -77,3 +101,40 @@ class IungoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="reconfigure", data_schema=data_schema, errors=errors
         )
+
+
+class IungoOptionsFlow(config_entries.OptionsFlow):
+    """Handle Iungo options."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage polling and sampling."""
+
+        errors = {}
+        if user_input is not None:
+            if user_input[CONF_MIN_UPDATE_INTERVAL] > user_input[CONF_MAX_UPDATE_INTERVAL]:
+                errors["base"] = "invalid_interval_bounds"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        interval = vol.All(vol.Coerce(int), vol.Range(min=5, max=3600))
+        data_schema = vol.Schema({
+            vol.Required(
+                CONF_MIN_UPDATE_INTERVAL,
+                default=options.get(
+                    CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL),
+            ): interval,
+            vol.Required(
+                CONF_MAX_UPDATE_INTERVAL,
+                default=options.get(
+                    CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL),
+            ): interval,
+            vol.Required(
+                CONF_SAMPLE_INTERVAL,
+                default=options.get(CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=300)),
+        })
+
+        return self.async_show_form(
+            step_id="init", data_schema=data_schema, errors=errors
+        )
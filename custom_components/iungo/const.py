@@ -3,13 +3,68 @@
 DOMAIN = "iungo"
 
 CONF_HOST = "host"
+CONF_MIN_UPDATE_INTERVAL = "min_update_interval"
+CONF_MAX_UPDATE_INTERVAL = "max_update_interval"
+CONF_SAMPLE_INTERVAL = "sample_interval"
 
 DEFAULT_HOST = "192.168.x.x"
 DEFAULT_UPDATE_INTERVAL = 30
+DEFAULT_MIN_UPDATE_INTERVAL = 10
+DEFAULT_MAX_UPDATE_INTERVAL = 300
+# Ceiling for the back-off while the box keeps failing
+ERROR_MAX_UPDATE_INTERVAL = 900
 DEFAULT_FIRMWARE_UPDATE_INTERVAL = 3600
+# Seconds between samples kept for min/max/mean attributes, 0 is off
+DEFAULT_SAMPLE_INTERVAL = 0
+HISTORY_MAX_SAMPLES = 720
 
 OBJECT_INFO_URL = "http://{host}/iungo/api_request/object_info"
 OBJECT_VALUES_URL = "http://{host}/iungo/api_request/objmgr_list_objects_props_values"
+OBJECT_PROPS_VALUES_URL = "http://{host}/iungo/api_request/object_list_props_values?oid={oid}"
 OBJECT_SYSINFO_URL = "http://{host}/iungo/api_request/sysinfo_version"
 OBJECT_HWINFO_URL = "http://{host}/iungo/api_request/sysinfo_hw_revision"
 OBJECT_LATEST_VERSION = "http://{host}/iungo/api_request/fw_get_remote_info"
+
+REQUEST_TIMEOUT = 10
+# Deadline for all firmware info requests together
+FIRMWARE_FETCH_TIMEOUT = 12
+# The box runs a small embedded web server: keep a couple of connections
+# open between polls instead of reconnecting every time.
+MAX_CONCURRENT_REQUESTS = 2
+KEEPALIVE_TIMEOUT = 75
+STREAM_CHUNK_SIZE = 4096
+# Props that change on nearly every reply without being readings: the box
+# clock and link traffic counters. They are left out of the values digest,
+# so a reply that differs only in these still counts as unchanged.
+VOLATILE_PROPS = frozenset({"time", "date", "bytes_rx", "bytes_tx"})
+
+# Replies at least this large are decoded in the executor, off the event loop
+DECODE_EXECUTOR_BYTES = 64 * 1024
+# Failed requests in a row that open the circuit breaker, and the bounds of
+# its back-off in seconds.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_MIN_BACKOFF = 5
+BREAKER_MAX_BACKOFF = 300
+
+# Only fetch the objects with entities when they are at most this fraction
+# of all objects, and once measured, cost at most this fraction of a full
+# fetch. Still fetch everything every FULL_FETCH_POLLS polls.
+SELECTIVE_FETCH_MAX_FRACTION = 0.5
+# Per object fetches take one request per object, and one failed request
+# fails the poll: above this many objects a single full fetch is cheaper.
+SELECTIVE_FETCH_MAX_OBJECTS = 8
+FULL_FETCH_POLLS = 20
+# What a request costs the box beyond its reply, in reply bytes
+REQUEST_COST_BYTES = 2048
+
+# Limits shared by all configured hubs: polls running at once, requests in
+# flight, and the random spread added to each hub's poll phase.
+FLEET_MAX_CONCURRENT_POLLS = 4
+FLEET_MAX_INFLIGHT_REQUESTS = 8
+FLEET_PHASE_JITTER = 2.0
+
+# Number of polls kept for the rolling poll metrics
+METRICS_WINDOW = 100
+
+STORAGE_VERSION = 2
+STORAGE_KEY = DOMAIN + ".{entry_id}.object_info"
@@ -1,32 +1,67 @@
 """Data coordinators for the iungo integration."""
 
-from datetime import timedelta
+import asyncio
+from collections import Counter
+from dataclasses import asdict
+from datetime import datetime, timedelta
 import logging
+import time
 
+from homeassistant.components.sensor import SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN, CONF_HOST, DEFAULT_UPDATE_INTERVAL, DEFAULT_FIRMWARE_UPDATE_INTERVAL
+from .const import STORAGE_KEY, STORAGE_VERSION, OBJECT_INFO_URL
+from .const import CONF_MIN_UPDATE_INTERVAL, CONF_MAX_UPDATE_INTERVAL
+from .const import DEFAULT_MIN_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL
+from .const import ERROR_MAX_UPDATE_INTERVAL
+from .const import FULL_FETCH_POLLS, SELECTIVE_FETCH_MAX_FRACTION
+from .const import SELECTIVE_FETCH_MAX_OBJECTS, REQUEST_COST_BYTES
+from .const import FIRMWARE_FETCH_TIMEOUT
+from .const import CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL, HISTORY_MAX_SAMPLES
+from .derived import DerivedMetrics, compile_derived_metrics
+from .history import SampleHistory
+from .engine import IungoPollEngine
 from .iungo import (
+    NOT_MODIFIED,
+    IungoClient,
     IungoError,
-    async_get_object_info,
-    async_get_object_values,
-    parse_object_values,
-    async_get_sysinfo,
-    async_get_hwinfo,
-    async_get_latest_version
+    ResponseValidators,
+    UnsupportedRequest,
+    diff_object_values,
 )
+from .metrics import PollMetrics, track_requests
+from .scheduler import AdaptivePollScheduler, RefreshPhaseLock
+from .schema import SensorSchema, compile_sensor_schema
+from .values import ValueStore
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class _ObjectInfoStore(Store):
+    """Store of the compiled object info of an entry."""
+
+    async def _async_migrate_func(self, old_major_version, old_minor_version, old_data):
+        """Discard object info stored by older versions; it is fetched again."""
+        return {}
+
+
 class IungoDataUpdateCoordinator(DataUpdateCoordinator):
     """Data update coordinator for Iungo data."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: IungoClient,
+        engine: IungoPollEngine,
+        phase_offset: float = 0.0,
+    ):
         super().__init__(
             hass,
             _LOGGER,
@@ -34,22 +69,245 @@ class IungoDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=DEFAULT_UPDATE_INTERVAL),
         )
         self.entry = entry
-        self.object_info = None
+        self.client = client
+        self.engine = engine
+        # Added once to the first scheduled interval to spread hubs out
+        self._phase_offset = phase_offset
+        # Ids of the objects in object info; the object info itself is not
+        # kept once compiled into the schema
+        self.object_ids: frozenset | None = None
+        self.firmware_build = None
+        self.schema: SensorSchema | None = None
+        # Values read by entities, by slot; slots survive schema changes
+        self.values = ValueStore()
+        # Metrics computed from the values once per poll
+        self.derived = DerivedMetrics()
+        # True while running on object info loaded from the store, until it
+        # is revalidated against the box
+        self.object_info_cached = False
+        self._revalidate_task: asyncio.Task | None = None
+        # (object_id, prop_id) pairs whose value changed in the last poll,
+        # None when every entity should refresh.
+        self.changed_keys: set | None = None
+        # (object_id, prop_id) pairs read by entities, with a count per pair
+        self._value_keys = Counter()
+        # Listener callbacks by the object_id passed as their context, None
+        # for listeners that want every update
+        self._object_listeners: dict[str | None, dict] = {}
+        self._listeners_last_success: bool | None = None
+        # Object ids in the last full values reply, and callbacks told about
+        # objects added to or removed from the box
+        self._object_ids: frozenset | None = None
+        self._objects_listeners: list = []
+        self._objects_task: asyncio.Task | None = None
+        self._selective_fetch_supported: bool | None = None
+        self._polls_since_full_fetch = 0
+        # Measured cost, see _record_fetch_cost, of the last full values
+        # fetch and of fetching sets of objects one by one, and the objects
+        # fetched one by one in the last poll, None after a full fetch
+        self._full_fetch_cost: int | None = None
+        self._selective_fetch_costs: dict[frozenset, int] = {}
+        self._fetched_objects: frozenset | None = None
+        # Lookup of the last full values reply
+        self._full_values: dict | None = None
+        self.metrics = PollMetrics()
+        # Box clock and reply sequence number as of the last poll; the clock
+        # tells when the values were sampled by the box
+        self.box_systime: datetime | None = None
+        self.box_seq: int | None = None
+        # Samples taken between polls while sampling is enabled, and their
+        # summary per (object_id, prop_id) as of the last poll
+        self.history: SampleHistory | None = None
+        self.history_stats: dict = {}
+        self._sample_task: asyncio.Task | None = None
+        # Objects with sample summaries as of the last listener update
+        self._sampled_objects: set[str] = set()
+        self._store = _ObjectInfoStore(
+            hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id=entry.entry_id))
+        self.scheduler = AdaptivePollScheduler(
+            *_interval_bounds(entry),
+            initial_interval=DEFAULT_UPDATE_INTERVAL,
+            error_max_interval=ERROR_MAX_UPDATE_INTERVAL,
+        )
+        # Aligns polls with the refresh of the values on the box, and the
+        # loop time the last poll requested values at
+        self.phase_lock = RefreshPhaseLock()
+        self._polled_at = 0.0
+
+    def apply_options(self) -> None:
+        """Apply changed options of the config entry."""
+        self.scheduler.set_bounds(*_interval_bounds(self.entry))
+        self.update_interval = timedelta(seconds=self.scheduler.interval)
+        self.async_update_sampling()
+
+    @callback
+    def async_update_sampling(self) -> None:
+        """Start or stop sampling between polls per the options."""
+        enabled = self._sample_interval() > 0 and self.schema is not None
+        if enabled and self._sample_task is None:
+            self.history = SampleHistory(
+                (
+                    descriptor.key for descriptor in self.schema.descriptors
+                    if descriptor.state_class == SensorStateClass.MEASUREMENT
+                ),
+                HISTORY_MAX_SAMPLES,
+            )
+            self._sample_task = self.entry.async_create_background_task(
+                self.hass, self._async_sample(), f"{DOMAIN}_sample")
+        elif not enabled and self._sample_task is not None:
+            self._sample_task.cancel()
+            self._sample_task = None
+            self.history = None
+            self.history_stats = {}
+
+    def _sample_interval(self) -> int:
+        """Return the configured seconds between samples, 0 when off."""
+        return self.entry.options.get(CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL)
+
+    async def _async_sample(self) -> None:
+        """Sample the buffered values until sampling is turned off.
+
+        Only the objects with buffered values are fetched when the box
+        supports per object requests. Samples go to the history only; the
+        entities are updated by the regular polls.
+        """
+        wanted = {}
+        for oid, prop_id in self.history.keys:
+            wanted.setdefault(oid, set()).add(prop_id)
+        oids = frozenset(wanted)
+        while True:
+            await asyncio.sleep(self._sample_interval())
+            selective = self._selective_fetch_supported and self._use_selective_fetch(
+                oids, len(self.object_ids or ()))
+            try:
+                async with self.engine.slot(self.entry.entry_id):
+                    with track_requests() as counters:
+                        if selective:
+                            object_values = await self.client.async_get_selected_object_values(
+                                wanted)
+                        else:
+                            object_values = await self.client.async_get_object_values_lookup()
+            except IungoError as err:
+                _LOGGER.debug("Could not take a sample: %s", err)
+                continue
+            self._record_fetch_cost(oids if selective else None, counters)
+            self.history.add(object_values)
 
     async def async_initialize(self):
-        """Initialize the coordinator by fetching object info."""
+        """Initialize the coordinator with object info.
+
+        Object info cached by an earlier run is used right away and
+        revalidated against the box in the background, again after every
+        successful poll until that succeeds. Without a cache the object info
+        is fetched before setup continues.
+        """
 
         host = self.entry.data.get(CONF_HOST)
         if not host:
             raise ConfigEntryNotReady(
                 "No host configured for Iungo integration")
 
-        session = async_get_clientsession(self.hass)
+        if self.schema is None:
+            cached = await self._store.async_load()
+            if cached and cached.get("schema"):
+                self._set_schema(
+                    SensorSchema.from_dict(cached["schema"]),
+                    frozenset(cached["object_ids"]),
+                    cached.get("build"),
+                )
+                if cached.get("validators"):
+                    self.client.remember_validators(
+                        OBJECT_INFO_URL, ResponseValidators(**cached["validators"]))
+                self.object_info_cached = True
+                self._async_schedule_revalidation()
+                return
+
         try:
-            self.object_info = await async_get_object_info(session, host)
+            await self._async_fetch_object_info()
         except IungoError as err:
             raise ConfigEntryNotReady from err
 
+    async def _async_fetch_object_info(self):
+        """Fetch object info from the box and store it with the firmware build.
+
+        Known object info is fetched conditionally: an unchanged reply is
+        not decoded and the compiled schema is kept.
+        """
+        sysinfo = await self.client.async_get_sysinfo()
+        # Without object info the client has no validators to match yet
+        object_info = await self.client.async_get_object_info(conditional=True)
+        build = (sysinfo.get("version") or {}).get("build")
+        if object_info is NOT_MODIFIED:
+            if build != self.firmware_build:
+                self.firmware_build = build
+                await self._async_save_object_info()
+            return
+        self._set_object_info(object_info, build)
+        await self._async_save_object_info()
+
+    async def _async_save_object_info(self) -> None:
+        """Store the compiled object info with the firmware build and validators."""
+        validators = self.client.validators_for(OBJECT_INFO_URL)
+        await self._store.async_save({
+            "build": self.firmware_build,
+            "schema": self.schema.as_dict(),
+            "object_ids": sorted(self.object_ids),
+            "validators": asdict(validators) if validators else None,
+        })
+
+    def _set_object_info(self, object_info: dict, build: str | None) -> None:
+        """Compile new object info into the sensor schema.
+
+        Only the schema and the object ids are kept: the object info tree,
+        with every driver, port and duplicate numeric prop key, is released.
+        """
+        self._set_schema(
+            compile_sensor_schema(object_info), frozenset(object_info), build)
+
+    def _set_schema(
+        self, schema: SensorSchema, object_ids: frozenset, build: str | None
+    ) -> None:
+        """Use a compiled sensor schema."""
+        self.schema = schema
+        self.object_ids = object_ids
+        self.firmware_build = build
+        self.values.add_keys(self.schema.index, self.schema.value_types)
+        self._update_derived_metrics()
+        self._selective_fetch_costs.clear()
+
+    @callback
+    def _async_schedule_revalidation(self) -> None:
+        """Revalidate cached object info in the background, once at a time."""
+        if self.object_info_cached and self._revalidate_task is None:
+            self._revalidate_task = self.entry.async_create_background_task(
+                self.hass,
+                self._async_revalidate_object_info(),
+                f"{DOMAIN}_revalidate_object_info",
+            )
+
+    async def _async_revalidate_object_info(self):
+        """Refresh cached object info, reloading the entry when it changed.
+
+        When the box does not answer, the object info stays cached and the
+        next successful poll tries again.
+        """
+        cached_schema = self.schema
+        cached_build = self.firmware_build
+        try:
+            await self._async_fetch_object_info()
+        except IungoError as err:
+            _LOGGER.debug("Could not revalidate cached object info: %s", err)
+            return
+        finally:
+            self._revalidate_task = None
+        self.object_info_cached = False
+        if cached_build != self.firmware_build:
+            _LOGGER.debug("Firmware build changed from %s to %s",
+                          cached_build, self.firmware_build)
+        if cached_schema.descriptors != self.schema.descriptors:
+            _LOGGER.info("Iungo objects changed, reloading entry")
+            self.hass.config_entries.async_schedule_reload(self.entry.entry_id)
+
     async def _async_update_data(self):
         """Fetch data from the Iungo API."""
 
@@ -57,49 +315,426 @@ class IungoDataUpdateCoordinator(DataUpdateCoordinator):
         if not host:
             raise UpdateFailed("No host configured for Iungo integration")
 
-        session = async_get_clientsession(self.hass)
         try:
-            if self.object_info is None:
+            if self.schema is None:
                 await self.async_initialize()
-            raw_object_values = await async_get_object_values(session, host)
-            object_values = parse_object_values(raw_object_values)
-            return {
-                "object_info": self.object_info,
-                "object_values": object_values,
-            }
+            previous = self.data.get("object_values") if self.data else None
+            async with self.engine.slot(self.entry.entry_id) as queue_lag:
+                started = time.perf_counter()
+                self._polled_at = self.hass.loop.time()
+                with track_requests() as counters:
+                    object_values = await self._async_fetch_object_values(previous)
+            self.metrics.record_fetch(time.perf_counter() - started, counters)
+            self._record_fetch_cost(self._fetched_objects, counters)
+            self.metrics.queue_lag_ms.add(queue_lag * 1000)
+            if counters.systime is not None:
+                self.box_systime = dt_util.utc_from_timestamp(counters.systime)
+            self.box_seq = counters.seq
+            if object_values is NOT_MODIFIED:
+                # Same snapshot as the last poll: nothing to diff or dispatch
+                object_values = previous
+                self.changed_keys = set()
+            else:
+                self.changed_keys = diff_object_values(previous, object_values)
+                self._update_values(object_values, self.changed_keys)
+            if self.history is not None:
+                self.history.add(object_values)
+                self.history_stats = self.history.publish()
+            self.metrics.changed_values.add(
+                sum(map(len, object_values.values()))
+                if self.changed_keys is None else len(self.changed_keys))
         except IungoError as err:
+            self.phase_lock.unlock()
+            self.update_interval = timedelta(
+                seconds=self.scheduler.record_error())
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
+        self._schedule_next_poll()
+        self._async_schedule_revalidation()
+        return {"object_values": object_values}
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context=None
+    ) -> CALLBACK_TYPE:
+        """Listen for data updates, indexed by the object_id in context."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        listeners = self._object_listeners.setdefault(context, {})
+        listeners[remove_listener] = update_callback
+
+        @callback
+        def _remove_listener() -> None:
+            remove_listener()
+            listeners.pop(remove_listener, None)
+            if not listeners and self._object_listeners.get(context) is listeners:
+                del self._object_listeners[context]
+
+        return _remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners of changed objects, timing the entities.
+
+        Every listener is updated after the first poll, on failures and on
+        recovery, as availability changes for all of them. Objects with
+        sample summaries are updated every poll, and once more after their
+        summaries are gone, as their attributes change without their values.
+        """
+        started = time.perf_counter()
+        sampled_objects = {oid for oid, _ in self.history_stats}
+        if (
+            self.changed_keys is None
+            or not self.last_update_success
+            or self._listeners_last_success is not True
+        ):
+            super().async_update_listeners()
+        else:
+            changed_objects = {oid for oid, _ in self.changed_keys}
+            changed_objects |= sampled_objects | self._sampled_objects
+            for context in (None, *changed_objects):
+                listeners = self._object_listeners.get(context)
+                if listeners:
+                    for update_callback in list(listeners.values()):
+                        update_callback()
+        self._listeners_last_success = self.last_update_success
+        self._sampled_objects = sampled_objects
+        self.metrics.entity_update_ms.add(
+            (time.perf_counter() - started) * 1000)
+
+    @callback
+    def async_register_value_keys(self, value_keys) -> CALLBACK_TYPE:
+        """Register (object_id, prop_id) pairs an entity reads.
+
+        Returns a callback that unregisters them again.
+        """
+        self._value_keys.update(value_keys)
+
+        @callback
+        def _unregister() -> None:
+            self._value_keys.subtract(value_keys)
+            self._value_keys += Counter()
+
+        return _unregister
+
+    def _update_values(self, object_values: dict, changed_keys=None) -> None:
+        """Write values to the store and recompute the derived metrics.
+
+        The keys of derived metrics whose result changed are added to
+        changed_keys, so their sensors are updated like those of props.
+        """
+        self.values.update(object_values, changed_keys)
+        changed_results = self.derived.evaluate(self.values, changed_keys)
+        if changed_keys is not None:
+            changed_keys.update(changed_results)
+
+    def _update_derived_metrics(self) -> None:
+        """Compile the derived metrics of the schema and fill in the values."""
+        self.derived.set_metrics(
+            compile_derived_metrics(self.schema, self.entry.entry_id),
+            self.async_value_slot,
+        )
+        if self.data and self.data.get("object_values") is not None:
+            self._update_values(self.data["object_values"])
+
+    @callback
+    def async_value_slot(self, key: tuple[str, str]) -> int:
+        """Return the value store slot of an (object_id, prop_id) pair."""
+        value_type = self.schema.value_types.get(key) if self.schema else None
+        if key not in self.values:
+            slot = self.values.slot(key, value_type)
+            if self.data and self.data.get("object_values") is not None:
+                self.values.update(self.data["object_values"])
+            return slot
+        return self.values.slot(key, value_type)
+
+    def _wanted_values(self, previous: dict | None) -> dict | None:
+        """Return {oid: prop_ids} to fetch, or None to fetch everything.
+
+        Everything is fetched unless fetching the wanted objects one by one
+        pays off, see _use_selective_fetch.
+        """
+        if (
+            previous is None
+            or not self._value_keys
+            or self._selective_fetch_supported is False
+            or self._polls_since_full_fetch >= FULL_FETCH_POLLS
+        ):
+            return None
+        wanted = {}
+        for oid, prop_id in self._value_keys:
+            # Only props the box reported, a per object reply must hold all
+            if prop_id in previous.get(oid, ()):
+                wanted.setdefault(oid, set()).add(prop_id)
+        if not self._use_selective_fetch(frozenset(wanted), len(previous)):
+            return None
+        return wanted
+
+    def _use_selective_fetch(self, oids: frozenset, object_count: int) -> bool:
+        """Return whether to fetch the values of oids one by one.
+
+        Each object takes a request of its own, so only few objects out of
+        many are fetched that way, see SELECTIVE_FETCH_MAX_OBJECTS. The first
+        such fetch of a set of objects measures its cost; from then on they
+        are only fetched one by one when that is a fraction of the cost of a
+        full fetch.
+        """
+        if (
+            not oids
+            or len(oids) > SELECTIVE_FETCH_MAX_OBJECTS
+            or len(oids) > SELECTIVE_FETCH_MAX_FRACTION * object_count
+        ):
+            return False
+        cost = self._selective_fetch_costs.get(oids)
+        return (
+            cost is None
+            or self._full_fetch_cost is None
+            or cost <= SELECTIVE_FETCH_MAX_FRACTION * self._full_fetch_cost
+        )
+
+    def _record_fetch_cost(self, oids: frozenset | None, counters) -> None:
+        """Record the cost of fetching oids one by one, or all with None.
+
+        The cost is the bytes received plus REQUEST_COST_BYTES per request.
+        """
+        cost = counters.bytes_received + counters.requests * REQUEST_COST_BYTES
+        if oids is None:
+            self._full_fetch_cost = cost
+        else:
+            self._selective_fetch_costs[oids] = cost
+
+    async def _async_fetch_object_values(self, previous: dict | None):
+        """Fetch the values of objects with entities, or of all objects.
+
+        Values fetched per object are merged into the previous lookup, so
+        props without entities keep their last fully fetched value. Returns
+        NOT_MODIFIED when a full fetch got the same values as the last one
+        and nothing changed them since.
+        """
+        wanted = self._wanted_values(previous)
+        self._fetched_objects = None
+        if wanted is not None:
+            try:
+                selected = await self.client.async_get_selected_object_values(wanted)
+            except UnsupportedRequest as err:
+                _LOGGER.debug(
+                    "Per object values not supported, fetching all: %s", err)
+                self._selective_fetch_supported = False
+            else:
+                self._selective_fetch_supported = True
+                self._polls_since_full_fetch += 1
+                self._fetched_objects = frozenset(wanted)
+                object_values = dict(previous)
+                for oid, props in selected.items():
+                    object_values[oid] = {**previous.get(oid, {}), **props}
+                return object_values
+        object_values = await self.client.async_get_object_values_lookup(
+            conditional=self._full_values is not None)
+        self._polls_since_full_fetch = 0
+        if object_values is NOT_MODIFIED:
+            # Per object fetches may have changed the previous lookup since
+            # the last full reply
+            if previous is self._full_values:
+                return NOT_MODIFIED
+            return self._full_values
+        self._full_values = object_values
+        self._check_object_ids(object_values)
+        return object_values
+
+    @callback
+    def async_add_objects_listener(self, objects_callback) -> CALLBACK_TYPE:
+        """Listen for objects added to or removed from the box.
+
+        The callback receives the descriptors of the added objects and the
+        ids of the removed ones. Returns a callback that stops listening.
+        """
+        self._objects_listeners.append(objects_callback)
+
+        @callback
+        def _remove_listener() -> None:
+            self._objects_listeners.remove(objects_callback)
+
+        return _remove_listener
+
+    def _check_object_ids(self, object_values: dict) -> None:
+        """Look for added or removed objects when the object ids changed."""
+        object_ids = frozenset(object_values)
+        if self._object_ids is None:
+            self._object_ids = object_ids
+        elif object_ids != self._object_ids and self._objects_task is None:
+            self._objects_task = self.entry.async_create_background_task(
+                self.hass,
+                self._async_update_objects(object_ids),
+                f"{DOMAIN}_update_objects",
+            )
+
+    async def _async_update_objects(self, object_ids: frozenset) -> None:
+        """Compile the sensors of added objects and drop removed ones.
+
+        The box has no per object info request, so object_info is fetched
+        and compiled as a whole. Objects count as removed when they are gone
+        from object_info, not when they merely miss from one values reply.
+        When the props of objects that were already known changed, the
+        entry is reloaded instead, like after revalidation. The new schema
+        is stored, with the validators of the reply, only once it is in use.
+        """
+        try:
+            object_info = await self.client.async_get_object_info(conditional=True)
+        except IungoError as err:
+            _LOGGER.debug("Could not fetch object info for new objects: %s", err)
+            return
+        finally:
+            self._objects_task = None
+        if object_info is NOT_MODIFIED:
+            self._object_ids = object_ids
+            return
+        known = self.object_ids or frozenset()
+        added = frozenset(oid for oid in object_info if oid not in known)
+        removed = frozenset(oid for oid in known if oid not in object_info)
+        self._object_ids = object_ids
+        previous_schema = self.schema
+        self._set_object_info(object_info, self.firmware_build)
+        await self._async_save_object_info()
+
+        if {
+            d for d in previous_schema.descriptors if d.object_id not in removed
+        } != {
+            d for d in self.schema.descriptors if d.object_id not in added
+        }:
+            _LOGGER.info("Iungo objects changed, reloading entry")
+            self.hass.config_entries.async_schedule_reload(self.entry.entry_id)
+            return
+        if not added and not removed:
+            return
+
+        added_descriptors = tuple(
+            d for d in self.schema.descriptors if d.object_id in added)
+        _LOGGER.info("Iungo objects added: %s, removed: %s",
+                     ", ".join(added) or "none", ", ".join(removed) or "none")
+        for objects_callback in list(self._objects_listeners):
+            objects_callback(added_descriptors, removed)
+
+    def _schedule_next_poll(self) -> None:
+        """Let the scheduler pick the interval until the next poll."""
+        index = self.schema.index if self.schema else {}
+        changed_objects = None
+        if self.changed_keys is not None:
+            changed_objects = {
+                oid for oid, prop_id in self.changed_keys
+                if (oid, prop_id) in index
+            }
+        tracked_objects = self.schema.objects if self.schema else ()
+        self.scheduler.record_poll(
+            changed_objects,
+            tracked_objects,
+            refresh_period=self.phase_lock.period if self.phase_lock.locked else None,
+        )
+        interval = self.scheduler.interval
+        # The base Home Assistant schedules the next poll at whole loop
+        # seconds plus a fixed fraction per coordinator. Polls are only
+        # aligned when that fraction is known, otherwise the time they are
+        # sent at is not.
+        fraction = getattr(self, "_microsecond", None)
+        if fraction is not None:
+            self.phase_lock.record_poll(
+                None if changed_objects is None else bool(changed_objects),
+                self._polled_at,
+                self.box_systime.timestamp() if self.box_systime else None,
+            )
+            interval = self.phase_lock.next_interval(
+                interval,
+                self.scheduler.min_interval,
+                int(self.hass.loop.time()) + fraction,
+            )
+        self.update_interval = timedelta(seconds=interval + self._phase_offset)
+        self._phase_offset = 0.0
+
+
+def _interval_bounds(entry: ConfigEntry) -> tuple[int, int]:
+    """Return the configured (min, max) data poll interval."""
+    return (
+        entry.options.get(CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL),
+        entry.options.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL),
+    )
+
 
 class IungoFirmwareUpdateCoordinator(DataUpdateCoordinator):
     """Data update coordinator for Iungo firmware info."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: IungoClient,
+        engine: IungoPollEngine,
+        phase_offset: float = 0.0,
+    ):
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN}_firmware",
             update_interval=timedelta(
-                seconds=DEFAULT_FIRMWARE_UPDATE_INTERVAL),
+                seconds=DEFAULT_FIRMWARE_UPDATE_INTERVAL + phase_offset),
         )
         self.entry = entry
+        self.client = client
+        self.engine = engine
+        self._hwinfo = None
 
     async def _async_update_data(self):
-        """Fetch firmware info from the Iungo API."""
+        """Fetch firmware info from the Iungo API.
+
+        The requests run in parallel under one deadline. A request that
+        fails or misses the deadline keeps its previous result; the update
+        only fails when nothing could be fetched. The hardware revision never
+        changes, so it is fetched until it succeeds once.
+        """
 
         host = self.entry.data.get(CONF_HOST)
         if not host:
             raise UpdateFailed("No host configured for Iungo integration")
 
-        session = async_get_clientsession(self.hass)
-        try:
-            sysinfo = await async_get_sysinfo(session, host)
-            hwinfo = await async_get_hwinfo(session, host)
-            latest_version = await async_get_latest_version(session, host)
-            return {
-                "sysinfo": sysinfo,
-                "hwinfo": hwinfo,
-                "latest_version": latest_version,
+        requests = {
+            "sysinfo": self.client.async_get_sysinfo,
+            "latest_version": self.client.async_get_latest_version,
+        }
+        if self._hwinfo is None:
+            requests["hwinfo"] = self.client.async_get_hwinfo
+
+        # Only the first interval carries the phase offset
+        self.update_interval = timedelta(
+            seconds=DEFAULT_FIRMWARE_UPDATE_INTERVAL)
+        async with self.engine.slot(self.entry.entry_id):
+            tasks = {
+                key: asyncio.create_task(request())
+                for key, request in requests.items()
             }
-        except IungoError as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
+            try:
+                _, pending = await asyncio.wait(
+                    tasks.values(), timeout=FIRMWARE_FETCH_TIMEOUT)
+            finally:
+                for task in tasks.values():
+                    task.cancel()
+
+        data = dict(self.data or {})
+        errors = []
+        for key, task in tasks.items():
+            if task in pending:
+                errors.append(f"{key}: timeout")
+                continue
+            err = task.exception()
+            if err is None:
+                data[key] = task.result()
+                if key == "hwinfo":
+                    self._hwinfo = data[key]
+            elif isinstance(err, IungoError):
+                errors.append(f"{key}: {err}")
+            else:
+                raise err
+        data.setdefault("hwinfo", self._hwinfo or {})
+
+        if len(errors) == len(tasks):
+            raise UpdateFailed(
+                f"Error communicating with API: {'; '.join(errors)}")
+        if errors:
+            _LOGGER.debug("Partial firmware update: %s", "; ".join(errors))
+        return data
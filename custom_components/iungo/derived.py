@@ -0,0 +1,269 @@
+"""Metrics derived from the values of Iungo objects.
+
+The metrics are declared below as formulas over (object_id, prop_id)
+inputs and compiled from the sensor schema into DerivedMetric objects. The
+data coordinator evaluates them once per poll, only those with a changed
+input, and sensors read the results.
+"""
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, replace
+from functools import partial
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+
+from .schema import SensorDescriptor, SensorSchema
+from .values import ValueStore
+
+# Totals of the pulses counted by breakout devices: driver name, metric id,
+# label, unit, object type of the device and the prop with pulses per unit
+BREAKOUT_TOTALS = (
+    ("energy-breakout", "calculated_energy", "Calculated Energy", "kWh",
+     "breakout", "ppkwh"),
+    ("water-breakout", "calculated_water", "Calculated Water", "m³",
+     "breakout_water", "kfact"),
+)
+
+# Props of energy taken from and returned to the grid; the first group an
+# object has props of both sides of gives its net energy
+NET_ENERGY_PROPS = (
+    (("T1", "T2"), ("-T1", "-T2")),
+    (("import",), ("export",)),
+)
+
+# (energy prop, price prop, sign) of the energy cost, and of the gas cost.
+# The cost prices all energy so far at the current prices, so it jumps when
+# a price changes; it has no state class to keep it out of the statistics.
+ENERGY_COST_PROPS = (
+    ("T1", "Cost-T1", 1),
+    ("T2", "Cost-T2", 1),
+    ("-T1", "Cost-nT1", -1),
+    ("-T2", "Cost-nT2", -1),
+)
+GAS_COST_PROPS = (("gas", "Cost-gas", 1),)
+
+# Props summed over all objects into a metric of the hub: prop id, metric
+# id and label
+HUB_SUMS = (
+    ("solar", "total_solar_power", "Total Solar Power"),
+)
+
+
+def _is_number(value) -> bool:
+    """Return True for int and float values, but not bools."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _breakout_total(offset, pulstotal, pulses):
+    """Return offset + pulstotal / pulses per unit."""
+    if offset is None:
+        offset = 0
+    if pulstotal is None:
+        pulstotal = 0
+    if pulses is None:
+        pulses = 1
+    if not (_is_number(offset) and _is_number(pulstotal) and _is_number(pulses)):
+        return None
+    if pulses == 0:
+        return None
+    return round(offset + pulstotal / pulses, 3)
+
+
+def _weighted_sum(weights: tuple[int, ...], *values):
+    """Return the sum of the values times their weights.
+
+    None when one of the values is missing or not a number.
+    """
+    total = 0
+    for weight, value in zip(weights, values):
+        if not _is_number(value):
+            return None
+        total += weight * value
+    return round(total, 3)
+
+
+def _priced_sum(signs: tuple[int, ...], *values):
+    """Return the sum of amount times price of (amount, price) value pairs."""
+    total = 0
+    for index, sign in enumerate(signs):
+        amount, price = values[2 * index], values[2 * index + 1]
+        if not (_is_number(amount) and _is_number(price)):
+            return None
+        total += sign * amount * price
+    return round(total, 2)
+
+
+@dataclass(frozen=True, slots=True)
+class DerivedMetric:
+    """A value computed from other values every poll.
+
+    descriptor describes the sensor showing it, under the (object_id,
+    metric_id) key of the descriptor; formula takes the values of inputs
+    as positional arguments.
+    """
+
+    descriptor: SensorDescriptor
+    inputs: tuple[tuple[str, str], ...]
+    formula: Callable
+
+    @property
+    def key(self) -> tuple[str, str]:
+        """Return the (object_id, metric_id) pair of the result."""
+        return self.descriptor.key
+
+
+def _object_descriptor(
+    first: SensorDescriptor, metric_id: str, label: str, unit: str, **overrides
+) -> SensorDescriptor:
+    """Return the descriptor of a metric of the object of first."""
+    descriptor = SensorDescriptor.create(
+        first.object_id,
+        first.object_type,
+        first.object_name,
+        first.object_description,
+        metric_id,
+        label,
+        unit,
+    )
+    return replace(descriptor, **overrides) if overrides else descriptor
+
+
+def compile_derived_metrics(
+    schema: SensorSchema, hub_id: str
+) -> tuple[DerivedMetric, ...]:
+    """Compile the derived metrics of the objects in a schema.
+
+    Metrics summing props over all objects are published under hub_id.
+    """
+    metrics = []
+    for oid, descriptors in schema.objects.items():
+        first = descriptors[0]
+        units = {d.prop_id: d.unit for d in descriptors}
+
+        for driver, metric_id, label, unit, object_type, pulses in BREAKOUT_TOTALS:
+            if first.object_name != driver:
+                continue
+            descriptor = SensorDescriptor.create(
+                oid, object_type, first.object_name, None, metric_id, label, unit)
+            metrics.append(DerivedMetric(
+                descriptor,
+                ((oid, "offset"), (oid, "pulstotal"), (oid, pulses)),
+                _breakout_total,
+            ))
+
+        for imports, exports in NET_ENERGY_PROPS:
+            imports = [prop for prop in imports if prop in units]
+            exports = [prop for prop in exports if prop in units]
+            if imports and exports:
+                metrics.append(DerivedMetric(
+                    _object_descriptor(
+                        first, "net_energy", "Net Energy", units[imports[0]],
+                        state_class=SensorStateClass.TOTAL),
+                    tuple((oid, prop) for prop in (*imports, *exports)),
+                    partial(_weighted_sum,
+                            (1,) * len(imports) + (-1,) * len(exports)),
+                ))
+                break
+
+        for pairs, metric_id, label in (
+            (ENERGY_COST_PROPS, "energy_cost", "Energy Cost"),
+            (GAS_COST_PROPS, "gas_cost", "Gas Cost"),
+        ):
+            pairs = [pair for pair in pairs if pair[0] in units and pair[1] in units]
+            if not any(sign > 0 for _, _, sign in pairs):
+                continue
+            # The currency of the prices, e.g. "€" of "€/kWh"
+            currency = units[pairs[0][1]].split("/", 1)[0]
+            metrics.append(DerivedMetric(
+                _object_descriptor(
+                    first, metric_id, label, currency,
+                    device_class=SensorDeviceClass.MONETARY,
+                    state_class=None,
+                    display_precision=2,
+                    icon="mdi:currency-eur" if currency == "€" else None),
+                tuple(
+                    (oid, prop)
+                    for energy, price, _ in pairs for prop in (energy, price)),
+                partial(_priced_sum, tuple(sign for _, _, sign in pairs)),
+            ))
+
+    for prop_id, metric_id, label in HUB_SUMS:
+        summed = [d for d in schema.descriptors if d.prop_id == prop_id]
+        if not summed:
+            continue
+        descriptor = SensorDescriptor.create(
+            hub_id, "Iungo", "Iungo Hub", None, metric_id, label, summed[0].unit)
+        metrics.append(DerivedMetric(
+            descriptor,
+            tuple(d.key for d in summed),
+            partial(_weighted_sum, (1,) * len(summed)),
+        ))
+    return tuple(metrics)
+
+
+class DerivedMetrics:
+    """Latest results of the derived metrics.
+
+    evaluate runs once per poll over the value store and recomputes only
+    the metrics with an input among the changed keys. Sensors read the
+    results by the key of their metric, and are updated when it changed
+    like sensors of a prop.
+    """
+
+    def __init__(self) -> None:
+        self.metrics: tuple[DerivedMetric, ...] = ()
+        self.results: dict[tuple[str, str], object] = {}
+        # Value store slots of the inputs of every metric, and the metrics
+        # reading each input
+        self._slots: dict[tuple[str, str], tuple[int, ...]] = {}
+        self._readers: dict[tuple[str, str], list[DerivedMetric]] = {}
+
+    def set_metrics(
+        self,
+        metrics: Iterable[DerivedMetric],
+        value_slot: Callable[[tuple[str, str]], int],
+    ) -> None:
+        """Use new metrics; value_slot returns the slot of an input.
+
+        The results are cleared until the next evaluate.
+        """
+        self.metrics = tuple(metrics)
+        self.results = {}
+        self._slots = {
+            metric.key: tuple(map(value_slot, metric.inputs))
+            for metric in self.metrics
+        }
+        self._readers = {}
+        for metric in self.metrics:
+            for key in metric.inputs:
+                self._readers.setdefault(key, []).append(metric)
+
+    def evaluate(self, values: ValueStore, changed_keys=None) -> set:
+        """Recompute the metrics reading changed_keys, or all without them.
+
+        Returns the keys of the metrics whose result changed.
+        """
+        if changed_keys is None:
+            metrics = self.metrics
+        else:
+            readers = self._readers
+            metrics = {
+                metric.key: metric
+                for key in changed_keys if key in readers
+                for metric in readers[key]
+            }.values()
+        get = values.get
+        results = self.results
+        slots = self._slots
+        changed = set()
+        for metric in metrics:
+            key = metric.key
+            result = metric.formula(*map(get, slots[key]))
+            if key not in results or results[key] != result:
+                results[key] = result
+                changed.add(key)
+        return changed
+
+    def get(self, key: tuple[str, str]):
+        """Return the result of a metric, None when not known."""
+        return self.results.get(key)
@@ -0,0 +1,45 @@
+"""Diagnostics support for the iungo integration."""
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_HOST
+
+# The host, and the MAC address and serial number in hwinfo
+TO_REDACT = {CONF_HOST, "mac", "serial"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict:
+    """Return diagnostics for a config entry."""
+    data_coordinator = entry.runtime_data.data
+    firmware_coordinator = entry.runtime_data.firmware
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "data": {
+            "last_update_success": data_coordinator.last_update_success,
+            "update_interval": data_coordinator.update_interval.total_seconds(),
+            "box_systime": data_coordinator.box_systime.isoformat()
+            if data_coordinator.box_systime else None,
+            "box_seq": data_coordinator.box_seq,
+            "sampled_values": len(data_coordinator.history.keys)
+            if data_coordinator.history else 0,
+            "firmware_build": data_coordinator.firmware_build,
+            "object_info_cached": data_coordinator.object_info_cached,
+            "sensors": len(data_coordinator.schema.descriptors)
+            if data_coordinator.schema else 0,
+            "poll_metrics": data_coordinator.metrics.as_dict(),
+            "phase_lock": data_coordinator.phase_lock.as_dict(),
+        },
+        "firmware": {
+            "last_update_success": firmware_coordinator.last_update_success,
+            "data": async_redact_data(firmware_coordinator.data, TO_REDACT),
+        },
+        "poll_engine": data_coordinator.engine.as_dict(),
+        "circuit_open": entry.runtime_data.client.circuit_open,
+    }
@@ -0,0 +1,81 @@
+"""Shared poll engine for all Iungo hubs."""
+
+import asyncio
+from contextlib import asynccontextmanager
+import random
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    FLEET_MAX_CONCURRENT_POLLS,
+    FLEET_MAX_INFLIGHT_REQUESTS,
+    FLEET_PHASE_JITTER,
+)
+from .metrics import RollingStats
+
+# Fractional part of the golden ratio: successive multiples spread evenly
+# over [0, 1) without knowing how many hubs there will be.
+_GOLDEN_RATIO_FRACTION = 0.6180339887
+
+
+class IungoPollEngine:
+    """Run the polls of every configured hub through shared limits.
+
+    At most FLEET_MAX_CONCURRENT_POLLS polls run at once across all hubs
+    and at most FLEET_MAX_INFLIGHT_REQUESTS requests are in flight in total;
+    each hub's client further caps its own requests. Hubs get spread out
+    phase offsets so their polls do not fire in bursts.
+    """
+
+    def __init__(self) -> None:
+        self.poll_semaphore = asyncio.Semaphore(FLEET_MAX_CONCURRENT_POLLS)
+        self.request_semaphore = asyncio.Semaphore(FLEET_MAX_INFLIGHT_REQUESTS)
+        self._hubs: dict[str, RollingStats] = {}
+        self._next_slot = 0
+
+    def register(self, hub_id: str) -> float:
+        """Register a hub and return its poll phase offset in seconds."""
+        self._hubs[hub_id] = RollingStats()
+        slot = self._next_slot
+        self._next_slot += 1
+        offset = (slot * _GOLDEN_RATIO_FRACTION) % 1 * DEFAULT_UPDATE_INTERVAL
+        return offset + random.uniform(0, FLEET_PHASE_JITTER)
+
+    def unregister(self, hub_id: str) -> None:
+        """Forget a hub."""
+        self._hubs.pop(hub_id, None)
+
+    @property
+    def hub_count(self) -> int:
+        """Return the number of registered hubs."""
+        return len(self._hubs)
+
+    @asynccontextmanager
+    async def slot(self, hub_id: str):
+        """Wait for a poll slot; yields the queue lag in seconds."""
+        queued = time.monotonic()
+        async with self.poll_semaphore:
+            lag = time.monotonic() - queued
+            if (stats := self._hubs.get(hub_id)) is not None:
+                stats.add(lag * 1000)
+            yield lag
+
+    def as_dict(self) -> dict:
+        """Return the queue lag of every hub."""
+        return {
+            "hubs": self.hub_count,
+            "queue_lag_ms": {
+                hub_id: stats.as_dict() for hub_id, stats in self._hubs.items()
+            },
+        }
+
+
+def async_get_poll_engine(hass: HomeAssistant) -> IungoPollEngine:
+    """Return the poll engine shared by all config entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (engine := domain_data.get("poll_engine")) is None:
+        engine = domain_data["poll_engine"] = IungoPollEngine()
+    return engine
@@ -0,0 +1,78 @@
+"""Sample history between data polls for the iungo integration."""
+
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from itertools import islice
+import math
+
+
+@dataclass(frozen=True, slots=True)
+class SampleStats:
+    """Summary of the samples of one value in a publish interval."""
+
+    min: float
+    max: float
+    mean: float
+    samples: int
+
+    def as_dict(self) -> dict:
+        """Return the summary as state attributes."""
+        return {
+            "min": self.min,
+            "max": self.max,
+            "mean": round(self.mean, 3),
+            "samples": self.samples,
+        }
+
+
+class SampleHistory:
+    """Ring buffers of recent samples per (object_id, prop_id).
+
+    Samples are added at the sample rate; every data poll publishes the
+    min, max and mean of each value over the samples added since the
+    previous publish. Missing and non-numeric values are kept as gaps.
+    """
+
+    def __init__(self, keys: Iterable[tuple[str, str]], max_samples: int) -> None:
+        self._buffers: dict[tuple[str, str], deque[float]] = {
+            key: deque(maxlen=max_samples) for key in keys
+        }
+        self._max_samples = max_samples
+        self._unpublished = 0
+
+    @property
+    def keys(self):
+        """Return the buffered (object_id, prop_id) pairs."""
+        return self._buffers.keys()
+
+    def add(self, object_values: dict) -> None:
+        """Add a sample of every buffered value from a values lookup."""
+        for (oid, prop_id), buffer in self._buffers.items():
+            value = object_values.get(oid, {}).get(prop_id)
+            if isinstance(value, str):
+                try:
+                    value = float(value)
+                except ValueError:
+                    value = None
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                value = math.nan
+            buffer.append(value)
+        self._unpublished = min(self._unpublished + 1, self._max_samples)
+
+    def publish(self) -> dict[tuple[str, str], SampleStats]:
+        """Summarize the samples added since the last publish."""
+        count = self._unpublished
+        self._unpublished = 0
+        stats = {}
+        if not count:
+            return stats
+        for key, buffer in self._buffers.items():
+            window = [
+                value for value in islice(buffer, len(buffer) - count, None)
+                if not math.isnan(value)
+            ]
+            if window:
+                stats[key] = SampleStats(
+                    min(window), max(window), sum(window) / len(window), len(window))
+        return stats
@@ -1,15 +1,64 @@
 """"Support for Iungo devices."""
 
+import codecs
+import contextlib
+from dataclasses import dataclass
+import hashlib
+import json
 import logging
 import asyncio
+import time
 import aiohttp
 
-from homeassistant.const import UnitOfVolumeFlowRate, UnitOfVolume, UnitOfArea, UnitOfTime
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .const import OBJECT_INFO_URL, OBJECT_VALUES_URL, OBJECT_SYSINFO_URL
-from .const import OBJECT_HWINFO_URL, OBJECT_LATEST_VERSION
+from .const import OBJECT_HWINFO_URL, OBJECT_LATEST_VERSION, OBJECT_PROPS_VALUES_URL
+from .const import KEEPALIVE_TIMEOUT, MAX_CONCURRENT_REQUESTS, REQUEST_TIMEOUT
+from .const import STREAM_CHUNK_SIZE
+from .const import DECODE_EXECUTOR_BYTES, VOLATILE_PROPS
+from .const import BREAKER_FAILURE_THRESHOLD, BREAKER_MIN_BACKOFF, BREAKER_MAX_BACKOFF
+from .metrics import RequestCounters, current_counters
+from .schema import compile_sensor_schema
 
 _LOGGER = logging.getLogger(__name__)
 
+# HTTP statuses the box answers unknown requests with
+UNSUPPORTED_STATUSES = (400, 404, 501)
+
+# Returned by conditional requests when the reply did not change
+NOT_MODIFIED = object()
+
+# Default decoder of reply bodies: orjson when installed, it decodes object
+# info about three times faster than the standard library
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+@dataclass(frozen=True, slots=True)
+class ResponseValidators:
+    """What identifies a reply: a digest of its "rv" part and HTTP validators."""
+
+    digest: str | None
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def reply_digest(body: bytes) -> str | None:
+    """Return a digest of the "rv" part of a raw reply, None if not found.
+
+    The envelope around rv holds the reply time before it and systime and
+    seq after it, which differ on every reply. Those members are scalars,
+    so the first "rv" key and the last "systime" key bound the rv part.
+    """
+    start = body.find(b'"rv"')
+    end = body.rfind(b'"systime"')
+    if start < 0 or end < start:
+        return None
+    return hashlib.blake2b(body[start:end], digest_size=16).hexdigest()
+
 
 class IungoError(Exception):
     """Base class for other exceptions"""
@@ -26,93 +75,373 @@ class InvalidAuth(IungoError):
     pass
 
 
-async def async_validate_connection(session: aiohttp.ClientSession, host: str) -> bool:
-    """Validate connection to the Iungo box using sysinfo URL."""
+class UnsupportedRequest(IungoError):
+    """Raised when the box does not support an API request."""
+    pass
+
+
+async def async_validate_connection(client: "IungoClient") -> bool:
+    """Validate connection to the Iungo box using sysinfo URL.
+
+    Hosts that do not answer the request like a Iungo box, such as another
+    web server rejecting it, count as not connected.
+    """
     try:
-        await async_get_sysinfo(session, host)
-    except (CannotConnect, InvalidAuth):
+        await client.async_get_sysinfo()
+    except IungoError:
         return False
     return True
 
 
-async def async_get_object_info(session: aiohttp.ClientSession, host: str):
-    """Fetch object info from the Iungo."""
-    url = OBJECT_INFO_URL.format(host=host)
-    try:
-        async with asyncio.timeout(10):
-            response = await session.get(url)
-            response.raise_for_status()
-            data = await response.json(content_type=None)
-            _LOGGER.debug("Fetched object info: %s", data)
-            return data.get("rv", {})
-    except asyncio.TimeoutError as exc:
-        raise CannotConnect(f"Timeout while connecting to {url}") from exc
-    except aiohttp.ClientError as exc:
-        raise CannotConnect(f"Error connecting to {url}: {exc}") from exc
-
-
-async def async_get_object_values(session: aiohttp.ClientSession, host: str):
-    """Fetch object values from the Iungo."""
-    url = OBJECT_VALUES_URL.format(host=host)
-    try:
-        async with asyncio.timeout(10):
-            response = await session.get(url)
-            response.raise_for_status()
-            data = await response.json(content_type=None)
-            _LOGGER.debug("Fetched object values: %s", data)
-            return data.get("rv", {})
-    except asyncio.TimeoutError as exc:
-        raise CannotConnect(f"Timeout while connecting to {url}") from exc
-    except aiohttp.ClientError as exc:
-        raise CannotConnect(f"Error connecting to {url}: {exc}") from exc
-
-
-async def async_get_sysinfo(session: aiohttp.ClientSession, host: str):
-    """Fetch system info from Iungo."""
-    url = OBJECT_SYSINFO_URL.format(host=host)
-    try:
-        async with asyncio.timeout(10):
-            response = await session.get(url)
-            response.raise_for_status()
-            data = await response.json(content_type=None)
-            _LOGGER.debug("Fetched sysinfo: %s", data)
-            return data.get("rv", {})
-    except asyncio.TimeoutError as exc:
-        raise CannotConnect(f"Timeout while connecting to {url}") from exc
-    except aiohttp.ClientError as exc:
-        raise CannotConnect(f"Error connecting to {url}: {exc}") from exc
-
-
-async def async_get_hwinfo(session: aiohttp.ClientSession, host: str):
-    """Fetch system info from Iungo."""
-    url = OBJECT_HWINFO_URL.format(host=host)
-    try:
-        async with asyncio.timeout(10):
-            response = await session.get(url)
-            response.raise_for_status()
-            data = await response.json(content_type=None)
-            _LOGGER.debug("Fetched hw info: %s", data)
-            return data.get("rv", {})
-    except asyncio.TimeoutError as exc:
-        raise CannotConnect(f"Timeout while connecting to {url}") from exc
-    except aiohttp.ClientError as exc:
-        raise CannotConnect(f"Error connecting to {url}: {exc}") from exc
-
-
-async def async_get_latest_version(session: aiohttp.ClientSession, host: str) -> str | None:
-    """Fetch the latest firmware version from the Iungo."""
-    url = OBJECT_LATEST_VERSION.format(host=host)
-    try:
-        async with asyncio.timeout(10):
-            response = await session.get(url)
-            response.raise_for_status()
-            data = await response.json(content_type=None)
-            _LOGGER.debug("Fetched latest version: %s", data)
-            return data.get("rv", {})
-    except asyncio.TimeoutError as exc:
-        raise CannotConnect(f"Timeout while connecting to {url}") from exc
-    except aiohttp.ClientError as exc:
-        raise CannotConnect(f"Error connecting to {url}: {exc}") from exc
+class IungoClient:
+    """Client for the Iungo API.
+
+    Every endpoint goes through a single request pipeline. When no session is
+    passed in, the client owns a dedicated connector for the box that keeps
+    connections alive between polls and caps the number of parallel requests,
+    so the small embedded web server is not flooded and polls skip the TCP
+    setup. A shared semaphore additionally caps requests across hubs.
+
+    Concurrent requests for the same URL share one fetch, and a circuit
+    breaker makes requests fail fast while the box is unreachable.
+
+    Reply bodies are decoded with decoder. When an executor is passed, such
+    as hass.async_add_executor_job, bodies of DECODE_EXECUTOR_BYTES or more
+    are decoded by it, so large object info does not block the event loop.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        session: aiohttp.ClientSession | None = None,
+        shared_semaphore: asyncio.Semaphore | None = None,
+        decoder=json_loads,
+        executor=None,
+    ):
+        self.host = host
+        self._decoder = decoder
+        self._executor = executor
+        self._session = session
+        self._owns_session = session is None
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # Limit shared with the clients of other hubs
+        self._shared_semaphore = shared_semaphore or contextlib.nullcontext()
+        # Fetches in flight by (url, parser_factory), shared by callers
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        # Validators of the last reply per url, for conditional requests
+        self._validators: dict[str, ResponseValidators] = {}
+        self._latest_version = None
+        # Circuit breaker state: failed requests in a row and when the
+        # open circuit lets a probe through
+        self._failures = 0
+        self._open_until: float | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the session, creating the dedicated one on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=MAX_CONCURRENT_REQUESTS,
+                limit_per_host=MAX_CONCURRENT_REQUESTS,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                enable_cleanup_closed=True,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._owns_session = True
+        return self._session
+
+    async def async_close(self) -> None:
+        """Close the dedicated session, if the client created it."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+        self._session = None
+
+    async def _async_request(
+        self,
+        url_template: str,
+        label: str,
+        parser_factory=None,
+        *,
+        conditional: bool = False,
+        **params,
+    ):
+        """Fetch an API endpoint and return the "rv" part of the reply.
+
+        With a parser_factory the body is streamed into a fresh parser and
+        the parser result is returned instead. Extra params are filled into
+        the url template. Conditional requests return NOT_MODIFIED when the
+        reply matches the last one, see _async_fetch.
+        """
+        url = url_template.format(host=self.host, **params)
+        await self._async_check_circuit()
+        data = await self._async_coalesced(url, parser_factory, conditional)
+        if data is NOT_MODIFIED:
+            _LOGGER.debug("Fetched %s: not modified", label)
+            return NOT_MODIFIED
+        _LOGGER.debug("Fetched %s: %s", label, data)
+        if parser_factory is not None:
+            return data
+        if data.get("ok") is False or data.get("error"):
+            self._validators.pop(url, None)
+            raise UnsupportedRequest(f"Error reply from {url}: {data.get('error')}")
+        return data.get("rv", {})
+
+    def validators_for(self, url_template: str) -> ResponseValidators | None:
+        """Return the validators of the last reply of an endpoint."""
+        return self._validators.get(url_template.format(host=self.host))
+
+    def remember_validators(
+        self, url_template: str, validators: ResponseValidators
+    ) -> None:
+        """Use validators kept from an earlier run for an endpoint."""
+        self._validators[url_template.format(host=self.host)] = validators
+
+    async def _async_coalesced(self, url, parser_factory, conditional=False):
+        """Fetch the url, sharing the fetch with callers already waiting on it.
+
+        Callers must not modify the returned data, other callers may hold
+        the same object.
+        """
+        key = (url, parser_factory, conditional)
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(
+                self._async_send(url, parser_factory, conditional))
+            task.add_done_callback(
+                lambda done: self._async_fetch_done(key, done))
+        # One caller giving up must not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    def _async_fetch_done(self, key: tuple, task: asyncio.Future) -> None:
+        """Forget a finished fetch; its callers have the result."""
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark the error retrieved in case every caller gave up
+            task.exception()
+
+    async def _async_send(self, url, parser_factory, conditional=False):
+        """Fetch the url within the request limits and map errors."""
+        try:
+            async with self._semaphore, self._shared_semaphore:
+                async with asyncio.timeout(REQUEST_TIMEOUT):
+                    data = await self._async_fetch(url, parser_factory, conditional)
+        except asyncio.TimeoutError as exc:
+            self._record_failure()
+            raise CannotConnect(f"Timeout while connecting to {url}") from exc
+        except aiohttp.ClientResponseError as exc:
+            if exc.status in UNSUPPORTED_STATUSES:
+                self._record_success()
+                raise UnsupportedRequest(
+                    f"Request not supported by {url}: {exc.status}") from exc
+            self._record_failure()
+            raise CannotConnect(f"Error connecting to {url}: {exc}") from exc
+        except aiohttp.ClientError as exc:
+            self._record_failure()
+            raise CannotConnect(f"Error connecting to {url}: {exc}") from exc
+        except ValueError as exc:
+            self._record_failure()
+            raise CannotConnect(f"Invalid reply from {url}: {exc}") from exc
+        self._record_success()
+        return data
+
+    async def _async_check_circuit(self) -> None:
+        """Fail fast while the circuit is open, probing the box when it may close.
+
+        After BREAKER_FAILURE_THRESHOLD failed requests in a row requests
+        fail without contacting the box for a back-off that doubles with
+        every further failure. Once it has passed, a cheap sysinfo request
+        probes the box before regular requests are let through again.
+        """
+        if self._open_until is None:
+            return
+        remaining = self._open_until - time.monotonic()
+        if remaining > 0:
+            raise CannotConnect(
+                f"{self.host} is unreachable, retrying in {remaining:.0f} s")
+        _LOGGER.debug("Probing %s after %d failed requests", self.host, self._failures)
+        await self._async_coalesced(OBJECT_SYSINFO_URL.format(host=self.host), None)
+
+    def _record_failure(self) -> None:
+        """Count a failed request, opening the circuit at the threshold."""
+        self._failures += 1
+        if self._failures >= BREAKER_FAILURE_THRESHOLD:
+            backoff = min(
+                BREAKER_MIN_BACKOFF * 2 ** (self._failures - BREAKER_FAILURE_THRESHOLD),
+                BREAKER_MAX_BACKOFF,
+            )
+            if self._open_until is None:
+                _LOGGER.info("%s is unreachable, pausing requests for %d s",
+                             self.host, backoff)
+            self._open_until = time.monotonic() + backoff
+
+    def _record_success(self) -> None:
+        """Close the circuit after the box answered."""
+        if self._open_until is not None:
+            _LOGGER.info("%s is reachable again", self.host)
+        self._failures = 0
+        self._open_until = None
+
+    @property
+    def circuit_open(self) -> bool:
+        """Return True while requests fail fast."""
+        return self._open_until is not None
+
+    async def _async_fetch(self, url: str, parser_factory=None, conditional=False):
+        """GET the url and decode the body.
+
+        A kept-alive connection may have been closed by the box while idle,
+        so a disconnect on the first attempt is retried once on a fresh
+        connection.
+
+        A conditional request sends the ETag and Last-Modified of the last
+        reply, and returns NOT_MODIFIED without decoding when the box
+        answers 304 or the digest of the reply matches the last one. A
+        streamed reply is parsed as it arrives, so it is compared with the
+        digest the parser took of it and NOT_MODIFIED spares the caller
+        from processing it.
+
+        The box clock and sequence number of the reply are recorded in the
+        RequestCounters of the caller.
+        """
+        session = self._get_session()
+        counters = current_counters() or RequestCounters()
+        known = self._validators.get(url) if conditional else None
+        headers = {}
+        if known is not None:
+            if known.etag:
+                headers["If-None-Match"] = known.etag
+            if known.last_modified:
+                headers["If-Modified-Since"] = known.last_modified
+        for attempt in range(2):
+            try:
+                async with session.get(url, headers=headers) as response:
+                    response.raise_for_status()
+                    counters.requests += 1
+                    if response.status == 304 and known is not None:
+                        return NOT_MODIFIED
+                    if parser_factory is None:
+                        body = await response.read()
+                        counters.bytes_received += len(body)
+                        if conditional:
+                            validators = ResponseValidators(
+                                reply_digest(body),
+                                response.headers.get("ETag"),
+                                response.headers.get("Last-Modified"),
+                            )
+                            if (
+                                known is not None
+                                and validators.digest is not None
+                                and validators.digest == known.digest
+                            ):
+                                self._validators[url] = validators
+                                return NOT_MODIFIED
+                        started = time.perf_counter()
+                        data = await self._async_decode(body)
+                        counters.parse_seconds += time.perf_counter() - started
+                        envelope = data
+                        if conditional:
+                            self._validators[url] = validators
+                    else:
+                        parser = parser_factory()
+                        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                            counters.bytes_received += len(chunk)
+                            started = time.perf_counter()
+                            parser.feed(chunk)
+                            counters.parse_seconds += time.perf_counter() - started
+                        started = time.perf_counter()
+                        data = parser.close()
+                        counters.parse_seconds += time.perf_counter() - started
+                        envelope = parser.envelope
+                    if isinstance(envelope, dict):
+                        counters.box_seconds += envelope.get("time") or 0
+                        counters.systime = envelope.get("systime", counters.systime)
+                        counters.seq = envelope.get("seq", counters.seq)
+                    if conditional and parser_factory is not None:
+                        validators = ResponseValidators(
+                            parser.digest,
+                            response.headers.get("ETag"),
+                            response.headers.get("Last-Modified"),
+                        )
+                        self._validators[url] = validators
+                        if (
+                            known is not None
+                            and validators.digest is not None
+                            and validators.digest == known.digest
+                        ):
+                            return NOT_MODIFIED
+                    return data
+            except aiohttp.ServerDisconnectedError:
+                if attempt:
+                    raise
+                _LOGGER.debug("Connection to %s was closed, retrying", url)
+
+    async def _async_decode(self, body: bytes):
+        """Decode a reply body, in the executor when it is large."""
+        if self._executor is not None and len(body) >= DECODE_EXECUTOR_BYTES:
+            return await self._executor(self._decoder, body)
+        return self._decoder(body)
+
+    async def async_get_object_info(self, conditional: bool = False):
+        """Fetch object info from the Iungo.
+
+        A conditional fetch returns NOT_MODIFIED when object info did not
+        change since the last conditional fetch, see remember_validators.
+        """
+        return await self._async_request(
+            OBJECT_INFO_URL, "object info", conditional=conditional)
+
+    async def async_get_object_values(self):
+        """Fetch object values from the Iungo."""
+        return await self._async_request(OBJECT_VALUES_URL, "object values")
+
+    async def async_get_object_values_lookup(self, conditional: bool = False):
+        """Fetch object values as a {object_id: {prop_id: value}} lookup.
+
+        The reply is parsed while it streams in, see ObjectValuesStreamParser.
+        A conditional fetch returns NOT_MODIFIED when the values are the
+        same as in the last conditional fetch.
+        """
+        return await self._async_request(
+            OBJECT_VALUES_URL, "object values", ObjectValuesStreamParser,
+            conditional=conditional)
+
+    async def async_get_selected_object_values(self, wanted: dict) -> dict:
+        """Fetch values of selected objects only.
+
+        wanted maps object ids to the prop ids to return. One request is made
+        per object; raises UnsupportedRequest when the firmware has no per
+        object request, or its reply is not for the object or misses one of
+        the prop ids.
+        """
+        oids = list(wanted)
+        replies = await asyncio.gather(*(
+            self._async_request(
+                OBJECT_PROPS_VALUES_URL, "object props values", oid=oid)
+            for oid in oids
+        ))
+        return {
+            oid: parse_object_props_values(reply, oid, wanted[oid])
+            for oid, reply in zip(oids, replies)
+        }
+
+    async def async_get_sysinfo(self):
+        """Fetch system info from Iungo."""
+        return await self._async_request(OBJECT_SYSINFO_URL, "sysinfo")
+
+    async def async_get_hwinfo(self):
+        """Fetch hardware info from Iungo."""
+        return await self._async_request(OBJECT_HWINFO_URL, "hw info")
+
+    async def async_get_latest_version(self):
+        """Fetch the latest firmware version from the Iungo.
+
+        The reply is only decoded when it changed since the last fetch.
+        """
+        latest_version = await self._async_request(
+            OBJECT_LATEST_VERSION, "latest version", conditional=True)
+        if latest_version is NOT_MODIFIED:
+            return self._latest_version
+        self._latest_version = latest_version
+        return latest_version
 
 
 def parse_object_values(values_json: dict) -> dict:
@@ -120,55 +449,243 @@ def parse_object_values(values_json: dict) -> dict:
     lookup = {}
     objects = values_json.get("objects", [])
     for obj in objects:
-        oid = obj.get("oid")
-        propsval = obj.get("propsval", [])
-        if not oid:
-            continue
-        lookup[oid] = {prop["id"]: prop["value"]
-                       for prop in propsval if "id" in prop and "value" in prop}
+        _add_object_values(lookup, obj)
     return lookup
 
 
+def parse_object_props_values(values_json: dict, oid: str, prop_ids=None) -> dict:
+    """Convert a single object values reply to {prop_id: value} format.
+
+    Accepts both a bare propsval list and an objects list holding the
+    object. Only the given prop_ids are kept when passed. The per object
+    request is not documented, so the reply is checked strictly: raises
+    UnsupportedRequest when it is for another object, has no propsval or
+    misses one of the prop_ids.
+    """
+    if values_json.get("oid", oid) != oid:
+        raise UnsupportedRequest(
+            f"Values reply for {values_json.get('oid')} instead of {oid}")
+    propsval = values_json.get("propsval")
+    if propsval is None:
+        for obj in values_json.get("objects") or ():
+            if obj.get("oid") == oid:
+                propsval = obj.get("propsval")
+                break
+    if not isinstance(propsval, list):
+        raise UnsupportedRequest(f"No values of {oid} in the reply")
+    props = {prop["id"]: prop["value"]
+             for prop in propsval
+             if "id" in prop and "value" in prop
+             and (prop_ids is None or prop["id"] in prop_ids)}
+    if prop_ids is not None and not props.keys() >= set(prop_ids):
+        raise UnsupportedRequest(
+            f"Values reply of {oid} misses {', '.join(set(prop_ids) - props.keys())}")
+    return props
+
+
+def diff_object_values(previous: dict | None, current: dict) -> set | None:
+    """Return the (object_id, prop_id) pairs that differ between two lookups.
+
+    Returns None when there is no previous lookup to compare against, which
+    callers treat as "everything changed".
+    """
+    if previous is None:
+        return None
+    changed = set()
+    for oid, props in current.items():
+        old_props = previous.get(oid)
+        if old_props == props:
+            continue
+        if old_props is None:
+            old_props = {}
+        for prop_id, value in props.items():
+            if prop_id not in old_props or old_props[prop_id] != value:
+                changed.add((oid, prop_id))
+        changed.update((oid, prop_id)
+                       for prop_id in old_props if prop_id not in props)
+    for oid, old_props in previous.items():
+        if oid not in current:
+            changed.update((oid, prop_id) for prop_id in old_props)
+    return changed
+
+
+def _add_object_values(lookup: dict, obj: dict) -> None:
+    """Add the propsval of one object from the values JSON to the lookup."""
+    oid = obj.get("oid")
+    propsval = obj.get("propsval", [])
+    if not oid:
+        return
+    lookup[oid] = {prop["id"]: prop["value"]
+                   for prop in propsval if "id" in prop and "value" in prop}
+
+
+_VALUE_END = frozenset(" \t\r\n,:]}")
+
+
+class ObjectValuesStreamParser:
+    """Incremental parser for the objmgr_list_objects_props_values reply.
+
+    Feed it the response body chunk by chunk. Entries of the "objects" array
+    are decoded one at a time and folded straight into the
+    {object_id: {prop_id: value}} lookup, so the full document is never held
+    in memory. Top level envelope fields (time, systime, seq, ...) are kept
+    in `envelope`, and `digest` identifies the content of rv like
+    reply_digest does, leaving out the VOLATILE_PROPS of the objects.
+    """
+
+    def __init__(self):
+        self.lookup = {}
+        self.envelope = {}
+        self.digest = None
+        # Hashes the text of the values decoded inside rv
+        self._hasher = None
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._raw_decode = json.JSONDecoder().raw_decode
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._parser = self._parse()
+
+    def feed(self, chunk: bytes) -> None:
+        """Feed the next chunk of the response body."""
+        text = self._decoder.decode(chunk)
+        if not text:
+            return
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        self._resume()
+
+    def close(self) -> dict:
+        """Finish parsing and return the lookup."""
+        self._buf = self._buf[self._pos:] + self._decoder.decode(b"", final=True)
+        self._pos = 0
+        self._eof = True
+        self._resume()
+        return self.lookup
+
+    def _resume(self) -> None:
+        """Run the parser until it needs more data or is done."""
+        if self._parser is None:
+            return
+        try:
+            next(self._parser)
+        except StopIteration:
+            self._parser = None
+
+    def _skip_ws(self):
+        """Skip whitespace, waiting for data when the buffer runs out."""
+        while True:
+            buf = self._buf
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            self._pos = pos
+            if pos < len(buf):
+                return
+            if self._eof:
+                raise json.JSONDecodeError(
+                    "Unexpected end of data", buf, pos)
+            yield
+
+    def _expect(self, chars: str):
+        """Consume one of the given structural characters and return it."""
+        yield from self._skip_ws()
+        char = self._buf[self._pos]
+        if char not in chars:
+            raise json.JSONDecodeError(
+                f"Expected one of {chars!r}", self._buf, self._pos)
+        self._pos += 1
+        return char
+
+    def _value(self):
+        """Decode one complete JSON value at the current position."""
+        yield from self._skip_ws()
+        while True:
+            try:
+                value, end = self._raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            else:
+                # A number cut off by the end of the buffer ("12" of "12.5")
+                # decodes fine, so only accept a value once the character
+                # after it is known to end it.
+                if self._eof or (end < len(self._buf) and self._buf[end] in _VALUE_END):
+                    if self._hasher is not None:
+                        self._hasher.update(self._buf[self._pos:end].encode())
+                    self._pos = end
+                    return value
+            yield
+
+    def _peek(self, char: str):
+        """Consume the given character if it comes next."""
+        yield from self._skip_ws()
+        if self._buf[self._pos] == char:
+            self._pos += 1
+            return True
+        return False
+
+    def _parse(self):
+        """Parse the reply envelope, streaming rv.objects."""
+        yield from self._members_of(self._parse_envelope_member)
+        yield from self._skip_trailing()
+
+    def _members_of(self, handle_member):
+        """Call handle_member for each key of the object at the position."""
+        yield from self._expect("{")
+        if (yield from self._peek("}")):
+            return
+        while True:
+            key = yield from self._value()
+            yield from self._expect(":")
+            yield from handle_member(key)
+            if (yield from self._expect(",}")) == "}":
+                return
+
+    def _parse_envelope_member(self, key):
+        """Handle one top level member of the reply."""
+        if key == "rv":
+            self._hasher = hashlib.blake2b(digest_size=16)
+            yield from self._members_of(self._parse_rv_member)
+            self.digest = self._hasher.hexdigest()
+            self._hasher = None
+        else:
+            self.envelope[key] = yield from self._value()
+
+    def _parse_rv_member(self, key):
+        """Handle one member of rv, streaming the objects array."""
+        if key != "objects":
+            yield from self._value()
+            return
+        yield from self._expect("[")
+        if (yield from self._peek("]")):
+            return
+        while True:
+            # Hash the decoded values instead of the text, without the
+            # volatile props
+            hasher, self._hasher = self._hasher, None
+            obj = yield from self._value()
+            self._hasher = hasher
+            if isinstance(obj, dict):
+                _add_object_values(self.lookup, obj)
+                values = self.lookup.get(obj.get("oid"), {})
+                obj = (obj.get("oid"), [
+                    (prop_id, value) for prop_id, value in values.items()
+                    if prop_id not in VOLATILE_PROPS])
+            hasher.update(repr(obj).encode())
+            if (yield from self._expect(",]")) == "]":
+                return
+
+    def _skip_trailing(self):
+        """Make sure nothing but whitespace follows the document."""
+        while not self._eof:
+            yield
+        buf = self._buf
+        if buf[self._pos:].strip():
+            raise json.JSONDecodeError("Extra data", buf, self._pos)
+
+
 def extract_sensors_from_object_info(object_info: dict):
     """Extract sensor definitions from Iungo object_info JSON, avoiding duplicates and skipping numeric keys."""
-    sensors = []
-    for obj_id, obj in object_info.items():
-        info = obj.get("info", {})
-        driver = info.get("driver", {})
-        props = driver.get("props", {})
-        obj_type = info.get("type", "unknown")
-        obj_name = driver.get("name", obj_id)
-        obj_description = driver.get("description", None)
-        seen_ids = set()
-        for prop_key, prop in props.items():
-            # Skip numeric keys (only use named keys)
-            if prop_key.isdigit():
-                continue
-            prop_id = prop.get("id", prop_key)
-            if prop_id in seen_ids:
-                continue  # Skip duplicate
-            seen_ids.add(prop_id)
-            # Only add properties with type 'number' or log == True
-
-            unit = prop.get("unit", None)
-            if unit is not None:
-                unit = unit.replace(
-                    "l/min", UnitOfVolumeFlowRate.LITERS_PER_MINUTE)
-                unit = unit.replace("m3", UnitOfVolume.CUBIC_METERS)
-                unit = unit.replace("m2", UnitOfArea.SQUARE_METERS)
-                unit = unit.replace("sec", UnitOfTime.SECONDS)
-                unit = unit.replace("¤/kWh", "€/kWh")
-                unit = unit.replace("¤/m³", "€/m³")
-
-            if prop.get("type") == "number" and unit is not None:
-                sensor = {
-                    "object_id": obj_id,
-                    "object_type": obj_type,
-                    "object_name": obj_name,
-                    "object_description": obj_description,
-                    "prop_id": prop_id,
-                    "prop_label": prop.get("label", prop_key),
-                    "unit": unit,
-                }
-                sensors.append(sensor)
-    return sensors
+    return [descriptor.as_dict()
+            for descriptor in compile_sensor_schema(object_info).descriptors]
@@ -0,0 +1,113 @@
+"""Poll metrics for the iungo integration."""
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from .const import METRICS_WINDOW
+
+
+@dataclass(slots=True)
+class RequestCounters:
+    """Totals of the API requests made while tracking."""
+
+    requests: int = 0
+    bytes_received: int = 0
+    parse_seconds: float = 0.0
+    box_seconds: float = 0.0
+    # Clock (Unix time) and reply sequence number of the box as of the
+    # last reply
+    systime: int | None = None
+    seq: int | None = None
+
+
+_CURRENT_COUNTERS: ContextVar[RequestCounters | None] = ContextVar(
+    "iungo_request_counters", default=None)
+
+
+@contextmanager
+def track_requests():
+    """Collect RequestCounters for requests made inside the block.
+
+    The counters follow the context into tasks started inside the block, so
+    parallel requests of one poll are counted too, while requests of other
+    coordinators are not.
+    """
+    counters = RequestCounters()
+    token = _CURRENT_COUNTERS.set(counters)
+    try:
+        yield counters
+    finally:
+        _CURRENT_COUNTERS.reset(token)
+
+
+def current_counters() -> RequestCounters | None:
+    """Return the counters of the enclosing track_requests block, if any."""
+    return _CURRENT_COUNTERS.get()
+
+
+class RollingStats:
+    """The last values of a metric with percentiles over them."""
+
+    def __init__(self, maxlen: int = METRICS_WINDOW) -> None:
+        self._values: deque[float] = deque(maxlen=maxlen)
+
+    def add(self, value: float) -> None:
+        """Add a value."""
+        self._values.append(value)
+
+    @property
+    def last(self) -> float | None:
+        """Return the most recent value."""
+        return self._values[-1] if self._values else None
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the nearest rank percentile of the kept values."""
+        if not self._values:
+            return None
+        ordered = sorted(self._values)
+        rank = max(0, round(percent / 100 * len(ordered)) - 1)
+        return ordered[min(rank, len(ordered) - 1)]
+
+    def as_dict(self) -> dict:
+        """Return the last value, median, p95 and maximum."""
+        return {
+            "last": self.last,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": max(self._values) if self._values else None,
+            "samples": len(self._values),
+        }
+
+
+class PollMetrics:
+    """Rolling metrics of the data coordinator's polls."""
+
+    def __init__(self) -> None:
+        self.fetch_ms = RollingStats()
+        self.payload_bytes = RollingStats()
+        self.parse_ms = RollingStats()
+        self.box_ms = RollingStats()
+        self.changed_values = RollingStats()
+        self.entity_update_ms = RollingStats()
+        self.queue_lag_ms = RollingStats()
+
+    def record_fetch(self, seconds: float, counters: RequestCounters) -> None:
+        """Record the fetch of one poll."""
+        self.fetch_ms.add(seconds * 1000)
+        self.payload_bytes.add(counters.bytes_received)
+        self.parse_ms.add(counters.parse_seconds * 1000)
+        self.box_ms.add(counters.box_seconds * 1000)
+
+    def as_dict(self) -> dict:
+        """Return all metrics."""
+        return {
+            "fetch_ms": self.fetch_ms.as_dict(),
+            "payload_bytes": self.payload_bytes.as_dict(),
+            "parse_ms": self.parse_ms.as_dict(),
+            "box_ms": self.box_ms.as_dict(),
+            "changed_values": self.changed_values.as_dict(),
+            "entity_update_ms": self.entity_update_ms.as_dict(),
+            "queue_lag_ms": self.queue_lag_ms.as_dict(),
+        }
@@ -0,0 +1,320 @@
+"""Poll scheduling for the iungo integration."""
+
+from collections.abc import Iterable
+import math
+import time
+
+# How much one new gap between changes moves the learned change period
+CHANGE_PERIOD_SMOOTHING = 0.3
+# Poll this many times per learned change period of the fastest object
+POLLS_PER_CHANGE_PERIOD = 2
+# Never grow the interval by more than this factor per poll
+MAX_INTERVAL_GROWTH = 2.0
+# Seconds after the estimated refresh of the box values to poll at
+PHASE_MARGIN = 1.0
+# Lock on once the refresh period is known within this fraction of it
+PHASE_LOCK_FRACTION = 0.1
+# Smallest probe step in seconds
+PHASE_MIN_STEP = 0.05
+# Shorter refresh periods are not worth aligning polls to
+MIN_LOCK_PERIOD = 5.0
+
+
+class AdaptivePollScheduler:
+    """Pick the data poll interval from how often object values change.
+
+    For every object the scheduler learns the typical time between value
+    changes. Shorter gaps are taken over at once and longer ones are
+    smoothed in, so the interval drops quickly when values start moving and
+    creeps back up while they are quiet. Errors double the interval up to
+    the error ceiling.
+
+    An object that changed in two polls in a row only shows that it changes
+    at least once per poll, not how often: such a gap is not learned, and
+    the object keeps the interval where it is. Only a refresh period
+    measured by the phase lock lets such objects lower it.
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        initial_interval: float,
+        error_max_interval: float,
+    ) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.error_max_interval = error_max_interval
+        self.interval = self._clamp(initial_interval)
+        self._periods: dict[str, float] = {}
+        self._last_change: dict[str, float] = {}
+        # Objects that changed in the last two polls
+        self._every_poll: set[str] = set()
+        self._last_poll: float | None = None
+
+    def set_bounds(self, min_interval: float, max_interval: float) -> None:
+        """Change the interval bounds."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = self._clamp(self.interval)
+
+    def _clamp(self, interval: float) -> float:
+        """Clamp an interval to the configured bounds."""
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def record_poll(
+        self,
+        changed_objects: Iterable[str] | None,
+        tracked_objects: Iterable[str],
+        now: float | None = None,
+        refresh_period: float | None = None,
+    ) -> float:
+        """Learn from a successful poll and return the next interval.
+
+        changed_objects is None when the poll could not be compared with a
+        previous one. refresh_period is the period the box refreshes its
+        values at, when measured.
+        """
+        if now is None:
+            now = time.monotonic()
+        if changed_objects is not None and self._last_poll is not None:
+            changed_objects = set(changed_objects)
+            self._every_poll &= changed_objects
+            for oid in changed_objects:
+                last = self._last_change.get(oid)
+                self._last_change[oid] = now
+                if last is None:
+                    continue
+                if last == self._last_poll:
+                    # Changed in the previous poll too: the gap is the poll
+                    # interval, not the change period
+                    self._every_poll.add(oid)
+                    continue
+                gap = now - last
+                period = self._periods.get(oid)
+                if period is None or gap < period:
+                    self._periods[oid] = gap
+                else:
+                    self._periods[oid] = period + \
+                        CHANGE_PERIOD_SMOOTHING * (gap - period)
+        self._last_poll = now
+
+        fastest = None
+        for oid in tracked_objects:
+            # Gaps of objects that have not changed yet count from the first
+            # poll they were seen in.
+            self._last_change.setdefault(oid, now)
+            if oid in self._every_poll:
+                # Keep the interval, unless the box is known to refresh
+                # faster
+                period = POLLS_PER_CHANGE_PERIOD * self.interval
+                if refresh_period is not None:
+                    period = min(period, POLLS_PER_CHANGE_PERIOD * refresh_period)
+            else:
+                period = self._periods.get(oid)
+            if period is None:
+                continue
+            # An object that has been quiet for longer than its usual period
+            # is treated as slowing down.
+            period = max(period, now - self._last_change[oid])
+            if fastest is None or period < fastest:
+                fastest = period
+
+        if fastest is None:
+            # Nothing has changed since the first poll, slow down until
+            # something does.
+            target = self.interval if changed_objects is None else self.max_interval
+        else:
+            target = fastest / POLLS_PER_CHANGE_PERIOD
+        # The interval may have been raised past max_interval by errors.
+        current = min(self.interval, self.max_interval)
+        self.interval = self._clamp(min(target, current * MAX_INTERVAL_GROWTH))
+        return self.interval
+
+    def record_error(self) -> float:
+        """Back off after a failed poll and return the next interval."""
+        self.interval = min(
+            max(self.interval, self.min_interval) * 2,
+            max(self.error_max_interval, self.max_interval),
+        )
+        return self.interval
+
+
+class RefreshPhaseLock:
+    """Time data polls just after the box refreshes its values.
+
+    The box refreshes values on its own cadence (a P1 telegram, a Modbus
+    read), so a poll at an arbitrary moment reads values that are half a
+    refresh period old on average. The lock measures the refresh period
+    and phase from which polls see changed values, and then polls
+    PHASE_MARGIN after each estimated refresh.
+
+    A refresh lies between a poll without and the next poll with changes.
+    While polls come faster than the refresh, every refresh is seen, and
+    the first and the latest of those brackets bound the period ever more
+    tightly. A poll that finds nothing changed shows the period is longer
+    than the time since the previous poll, so polls that far apart still
+    see every refresh. Once it is known well enough, polls are aligned. Every aligned
+    poll that finds changed values moves the estimate a step earlier,
+    probing whether the refresh comes sooner. A poll that finds nothing
+    changed came before the refresh, and is followed up soon to bracket the
+    refresh again, which corrects the phase and narrows the period. When
+    the follow up finds no change either, the values stopped moving and
+    the lock is released until they move again.
+    """
+
+    def __init__(self) -> None:
+        self.period: float | None = None
+        # Monotonic time of an estimated refresh, None while unlocked
+        self.refresh: float | None = None
+        self._step = 0.0
+        # Polls around the first bracketed refresh, refreshes counted since
+        # while unlocked, and the bounds of the period so far
+        self._reference: tuple[float, float] | None = None
+        self._refreshes = 0
+        self._bounds: tuple[float, float] | None = None
+        # Longest time between polls without a change while unlocked; the
+        # period is longer
+        self._quiet_gap = 0.0
+        # Set after an aligned poll found no change, and the last aligned
+        # poll that found changes
+        self._missed = False
+        self._seen_at = 0.0
+        self._last_poll: float | None = None
+        self._systime: float | None = None
+
+    @property
+    def locked(self) -> bool:
+        """Return True while polls are aligned to the refresh."""
+        return self.refresh is not None
+
+    def unlock(self) -> None:
+        """Forget the estimates and start measuring again."""
+        self.period = None
+        self.refresh = None
+        self._reference = None
+        self._bounds = None
+        self._quiet_gap = 0.0
+        self._missed = False
+
+    def record_poll(
+        self, changed: bool | None, polled_at: float, systime: float | None = None
+    ) -> None:
+        """Learn from a successful poll.
+
+        changed tells whether values changed since the previous poll, None
+        when it is not known, and polled_at is the monotonic time the values
+        were requested. systime is the box clock of the reply; when it runs
+        backwards the box was restarted or its clock set, and the estimate
+        starts over.
+        """
+        last_poll, self._last_poll = self._last_poll, polled_at
+        if systime is not None:
+            if self._systime is not None and systime < self._systime:
+                self.unlock()
+            self._systime = systime
+        if changed is None or last_poll is None:
+            self.unlock()
+            return
+        if self._missed:
+            self._missed = False
+            if not changed:
+                self.unlock()
+                return
+            # The refresh also came at most a period after the last aligned
+            # poll that saw one
+            latest = max(min(polled_at, self._seen_at + self._bounds[1]), last_poll)
+            bracket = (last_poll, latest)
+            gap = (sum(bracket) - sum(self._reference)) / 2
+            cycles = round(gap / self._bounds[1])
+            # Only narrow the period when the bounds agree on the cycles
+            self._observe(
+                bracket, cycles if cycles == round(gap / self._bounds[0]) else 0)
+        elif self.refresh is not None:
+            if not changed:
+                self._missed = True
+                return
+            self._seen_at = polled_at
+            # Probe a step earlier in the next period
+            self.refresh += round(
+                (polled_at - self.refresh) / self.period) * self.period
+            self.refresh -= self._step
+        elif changed:
+            gap = polled_at - last_poll
+            if (
+                self._bounds is not None
+                and gap >= self._bounds[0]
+                and gap > self._quiet_gap + PHASE_MARGIN
+            ):
+                # A refresh may have gone unseen, count afresh
+                self._reference = self._bounds = None
+            self._refreshes += 1
+            self._observe((last_poll, polled_at), self._refreshes)
+        else:
+            self._quiet_gap = max(self._quiet_gap, polled_at - last_poll)
+
+    def _observe(self, bracket: tuple[float, float], cycles: int) -> None:
+        """Learn from a refresh seen cycles periods after the reference."""
+        reference = self._reference
+        if reference is None:
+            self._reference = bracket
+            self._refreshes = 0
+            return
+        if cycles > 0:
+            low = max((bracket[0] - reference[1]) / cycles, self._quiet_gap)
+            high = (bracket[1] - reference[0]) / cycles
+            if self._bounds is not None:
+                if low > self._bounds[1] or high < self._bounds[0]:
+                    # The refresh cadence changed
+                    self.unlock()
+                    self._reference = bracket
+                    self._refreshes = 0
+                    return
+                low = max(low, self._bounds[0])
+                high = min(high, self._bounds[1])
+            self._bounds = (low, high)
+        if self._bounds is None:
+            return
+        low, high = self._bounds
+        period = (low + high) / 2
+        if self.refresh is None and (
+            period < MIN_LOCK_PERIOD or high - low > PHASE_LOCK_FRACTION * period
+        ):
+            return
+        self.period = period
+        self.refresh = self._seen_at = bracket[1]
+        self._step = max(
+            (bracket[1] - bracket[0]) / 4, (high - low) / 2, PHASE_MIN_STEP)
+
+    def next_interval(
+        self, interval: float, min_interval: float, now: float | None = None
+    ) -> float:
+        """Align an interval picked by the scheduler to the refresh.
+
+        Polls come a whole number of refresh periods apart, one period when
+        the scheduler asks for more than one poll per period, and never
+        sooner than min_interval after now. After a miss the next poll
+        comes as soon as min_interval allows.
+        """
+        if self.refresh is None:
+            return interval
+        if self._missed:
+            return max(min_interval, self._step + PHASE_MARGIN)
+        if now is None:
+            now = time.monotonic()
+        period = self.period
+        target = self.refresh + PHASE_MARGIN
+        # The first aligned time after now, then the periods after that
+        target += max(0, math.ceil((now - target) / period)) * period
+        target += (max(1, round(interval / period)) - 1) * period
+        while target - now < min_interval:
+            target += period
+        return target - now
+
+    def as_dict(self) -> dict:
+        """Return the lock state."""
+        return {
+            "locked": self.locked,
+            "period": self.period,
+            "step": self._step if self.locked else None,
+        }
@@ -0,0 +1,285 @@
+"""Compiled sensor schema for the iungo integration.
+
+object_info is walked once into a table of frozen SensorDescriptor
+objects, indexed by (object_id, prop_id), with units, device/state classes,
+display precision and names resolved up front.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import UnitOfVolumeFlowRate, UnitOfVolume, UnitOfArea, UnitOfTime
+
+# Simple mapping for device_class and state_class based on unit/label/id
+DEVICE_CLASS_MAP = {
+    "W": SensorDeviceClass.POWER,
+    "kWh": SensorDeviceClass.ENERGY,
+    "V": SensorDeviceClass.VOLTAGE,
+    "A": SensorDeviceClass.CURRENT,
+    "°C": SensorDeviceClass.TEMPERATURE,
+    "m³": SensorDeviceClass.GAS,
+    "m³/h": SensorDeviceClass.VOLUME_FLOW_RATE,
+    "%": SensorDeviceClass.HUMIDITY,
+    "hPa": SensorDeviceClass.PRESSURE,
+    "mm/h": SensorDeviceClass.PRECIPITATION_INTENSITY,
+    "L/min": SensorDeviceClass.VOLUME_FLOW_RATE,
+    "W/m²": SensorDeviceClass.IRRADIANCE,
+    "m/s": SensorDeviceClass.WIND_SPEED,
+    "°": SensorDeviceClass.WIND_DIRECTION,
+}
+
+STATE_CLASS_MAP = {
+    "kWh": SensorStateClass.TOTAL_INCREASING,
+    "m³": SensorStateClass.TOTAL_INCREASING,
+    "m³/h": SensorStateClass.MEASUREMENT,
+    "W": SensorStateClass.MEASUREMENT,
+    "V": SensorStateClass.MEASUREMENT,
+    "A": SensorStateClass.MEASUREMENT,
+    "°C": SensorStateClass.MEASUREMENT,
+    "%": SensorStateClass.MEASUREMENT,
+    "hPa": SensorStateClass.MEASUREMENT,
+    "mm/h": SensorStateClass.MEASUREMENT,
+    "L/min": SensorStateClass.MEASUREMENT,
+    "W/m²": SensorStateClass.MEASUREMENT,
+    "m/s": SensorStateClass.MEASUREMENT,
+    "°": SensorStateClass.MEASUREMENT_ANGLE,
+}
+
+DISPLAY_PRECISION_MAP = {
+    "kWh": 3,
+    "m³": 3,
+    "W": 0,
+    "V": 1,
+    "A": 2,
+    "°C": 1,
+    "°": 0,
+    "%": 0,
+    "hPa": 1,
+    "mm/h": 1,
+    "L/min": 3,
+    "puls/kWh": 0,
+    "puls": 0,
+    "x": 0,
+    "s": 0,
+    "puls/m³": 0,
+    "€/kWh": 3,
+    "€/m³": 3,
+    "m³/h": 3,
+    "m/s": 1,
+    "W/m²": 0,
+}
+
+TARIFF_LABEL_MAP = {
+    "T1": "Tariff 1",
+    "-T1": "Tariff 1 (Returned)",
+    "T2": "Tariff 2",
+    "-T2": "Tariff 2 (Returned)",
+    "€ T1": "Cost Tariff 1",
+    "€ -T1": "Cost Tariff 1 (Returned)",
+    "€ T2": "Cost Tariff 2",
+    "€ -T2": "Cost Tariff 2 (Returned)",
+    "€ Gas": "Cost Gas",
+    "Pulses / kW·h": "Pulses/kWh",
+}
+
+
+def _has_euro_unit(unit: str | None) -> bool:
+    """Return True when the unit represents a euro-denominated value."""
+    if not unit:
+        return False
+
+    euro_tokens = ("€/", "¤/", "â‚¬/", "EUR/")
+    return any(token in unit for token in euro_tokens)
+
+
+UNIT_REPLACEMENTS = (
+    ("l/min", UnitOfVolumeFlowRate.LITERS_PER_MINUTE),
+    ("m3", UnitOfVolume.CUBIC_METERS),
+    ("m2", UnitOfArea.SQUARE_METERS),
+    ("sec", UnitOfTime.SECONDS),
+    ("¤/kWh", "€/kWh"),
+    ("¤/m³", "€/m³"),
+)
+
+
+@lru_cache(maxsize=256)
+def normalize_unit(unit: str) -> str:
+    """Map a unit reported by the Iungo to the Home Assistant unit."""
+    for old, new in UNIT_REPLACEMENTS:
+        unit = unit.replace(old, new)
+    return unit
+
+
+@lru_cache(maxsize=256)
+def _unit_metadata(unit: str, object_type: str):
+    """Return device class, state class, display precision and icon."""
+    device_class = DEVICE_CLASS_MAP.get(unit)
+    # Override for water meters
+    if unit == "m³" and object_type in ("water", "breakout_water"):
+        device_class = SensorDeviceClass.WATER
+    icon = "mdi:currency-eur" if _has_euro_unit(unit) else None
+    return (
+        device_class,
+        STATE_CLASS_MAP.get(unit),
+        DISPLAY_PRECISION_MAP.get(unit, 2),
+        icon,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class SensorDescriptor:
+    """Everything needed to create and update one Iungo sensor."""
+
+    object_id: str
+    object_type: str
+    object_name: str
+    object_description: str | None
+    prop_id: str
+    prop_label: str
+    unit: str
+    name: str
+    device_class: SensorDeviceClass | None
+    state_class: SensorStateClass | None
+    display_precision: int
+    icon: str | None
+
+    @classmethod
+    def create(
+        cls,
+        object_id: str,
+        object_type: str,
+        object_name: str,
+        object_description: str | None,
+        prop_id: str,
+        prop_label: str,
+        unit: str,
+    ) -> "SensorDescriptor":
+        """Create a descriptor, resolving the unit dependent metadata."""
+        device_class, state_class, display_precision, icon = _unit_metadata(
+            unit, object_type)
+        return cls(
+            object_id=object_id,
+            object_type=object_type,
+            object_name=object_name,
+            object_description=object_description,
+            prop_id=prop_id,
+            prop_label=prop_label,
+            unit=unit,
+            name=TARIFF_LABEL_MAP.get(prop_label, prop_label),
+            device_class=device_class,
+            state_class=state_class,
+            display_precision=display_precision,
+            icon=icon,
+        )
+
+    @property
+    def key(self) -> tuple[str, str]:
+        """Return the (object_id, prop_id) pair of the sensor."""
+        return (self.object_id, self.prop_id)
+
+    def as_dict(self) -> dict:
+        """Return the sensor definition in the extract_sensors format."""
+        return {
+            "object_id": self.object_id,
+            "object_type": self.object_type,
+            "object_name": self.object_name,
+            "object_description": self.object_description,
+            "prop_id": self.prop_id,
+            "prop_label": self.prop_label,
+            "unit": self.unit,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class SensorSchema:
+    """Sensor descriptors of all objects, with lookup indexes."""
+
+    descriptors: tuple[SensorDescriptor, ...]
+    index: Mapping[tuple[str, str], SensorDescriptor]
+    objects: Mapping[str, tuple[SensorDescriptor, ...]]
+    # Declared type ("number", "string", "boolean", ...) of every property
+    value_types: Mapping[tuple[str, str], str]
+
+    @classmethod
+    def from_descriptors(cls, descriptors, value_types=None) -> "SensorSchema":
+        """Build the schema and its indexes from a list of descriptors."""
+        descriptors = tuple(descriptors)
+        objects = {}
+        for descriptor in descriptors:
+            objects.setdefault(descriptor.object_id, []).append(descriptor)
+        return cls(
+            descriptors=descriptors,
+            index=MappingProxyType({d.key: d for d in descriptors}),
+            objects=MappingProxyType(
+                {oid: tuple(descs) for oid, descs in objects.items()}),
+            value_types=MappingProxyType(dict(value_types or {})),
+        )
+
+    def get(self, object_id: str, prop_id: str) -> SensorDescriptor | None:
+        """Return the descriptor of a property, if it has a sensor."""
+        return self.index.get((object_id, prop_id))
+
+    def as_dict(self) -> dict:
+        """Return the schema in a JSON serializable form, see from_dict."""
+        return {
+            "sensors": [descriptor.as_dict() for descriptor in self.descriptors],
+            "value_types": [
+                [oid, prop_id, value_type]
+                for (oid, prop_id), value_type in self.value_types.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SensorSchema":
+        """Rebuild a schema from its as_dict form."""
+        return cls.from_descriptors(
+            (SensorDescriptor.create(**sensor) for sensor in data["sensors"]),
+            {(oid, prop_id): value_type
+             for oid, prop_id, value_type in data["value_types"]},
+        )
+
+
+def compile_sensor_schema(object_info: dict) -> SensorSchema:
+    """Compile Iungo object_info JSON into a SensorSchema.
+
+    Only named (non numeric) property keys are used, duplicates are skipped
+    and only numeric properties with a unit become sensors.
+    """
+    descriptors = []
+    value_types = {}
+    for obj_id, obj in object_info.items():
+        info = obj.get("info", {})
+        driver = info.get("driver", {})
+        props = driver.get("props", {})
+        obj_type = info.get("type", "unknown")
+        obj_name = driver.get("name", obj_id)
+        obj_description = driver.get("description", None)
+        seen_ids = set()
+        for prop_key, prop in props.items():
+            # Skip numeric keys (only use named keys)
+            if prop_key.isdigit():
+                continue
+            prop_id = prop.get("id", prop_key)
+            if prop_id in seen_ids:
+                continue  # Skip duplicate
+            seen_ids.add(prop_id)
+            value_types[(obj_id, prop_id)] = prop.get("type")
+
+            unit = prop.get("unit", None)
+            if prop.get("type") != "number" or unit is None:
+                continue
+            descriptors.append(
+                SensorDescriptor.create(
+                    obj_id,
+                    obj_type,
+                    obj_name,
+                    obj_description,
+                    prop_id,
+                    prop.get("label", prop_key),
+                    normalize_unit(unit),
+                )
+            )
+    return SensorSchema.from_descriptors(descriptors, value_types)
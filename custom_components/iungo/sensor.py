@@ -8,136 +8,100 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import _hub_configuration_url
-from .const import DOMAIN, CONF_HOST
+from . import _hub_device_info
+from .const import DOMAIN
 from .coordinator import IungoDataUpdateCoordinator, IungoFirmwareUpdateCoordinator
-from .iungo import extract_sensors_from_object_info
+from .derived import DerivedMetric
+from .schema import SensorDescriptor
 
 _LOGGER = logging.getLogger(__name__)
 
-# Simple mapping for device_class and state_class based on unit/label/id
-DEVICE_CLASS_MAP = {
-    "W": SensorDeviceClass.POWER,
-    "kWh": SensorDeviceClass.ENERGY,
-    "V": SensorDeviceClass.VOLTAGE,
-    "A": SensorDeviceClass.CURRENT,
-    "°C": SensorDeviceClass.TEMPERATURE,
-    "m³": SensorDeviceClass.GAS,
-    "m³/h": SensorDeviceClass.VOLUME_FLOW_RATE,
-    "%": SensorDeviceClass.HUMIDITY,
-    "hPa": SensorDeviceClass.PRESSURE,
-    "mm/h": SensorDeviceClass.PRECIPITATION_INTENSITY,
-    "L/min": SensorDeviceClass.VOLUME_FLOW_RATE,
-    "W/m²": SensorDeviceClass.IRRADIANCE,
-    "m/s": SensorDeviceClass.WIND_SPEED,
-    "°": SensorDeviceClass.WIND_DIRECTION,
-}
-
-STATE_CLASS_MAP = {
-    "kWh": SensorStateClass.TOTAL_INCREASING,
-    "m³": SensorStateClass.TOTAL_INCREASING,
-    "m³/h": SensorStateClass.MEASUREMENT,
-    "W": SensorStateClass.MEASUREMENT,
-    "V": SensorStateClass.MEASUREMENT,
-    "A": SensorStateClass.MEASUREMENT,
-    "°C": SensorStateClass.MEASUREMENT,
-    "%": SensorStateClass.MEASUREMENT,
-    "hPa": SensorStateClass.MEASUREMENT,
-    "mm/h": SensorStateClass.MEASUREMENT,
-    "L/min": SensorStateClass.MEASUREMENT,
-    "W/m²": SensorStateClass.MEASUREMENT,
-    "m/s": SensorStateClass.MEASUREMENT,
-    "°": SensorStateClass.MEASUREMENT_ANGLE,
-}
-
-DISPLAY_PRECISION_MAP = {
-    "kWh": 3,
-    "m³": 3,
-    "W": 0,
-    "V": 1,
-    "A": 2,
-    "°C": 1,
-    "°": 0,
-    "%": 0,
-    "hPa": 1,
-    "mm/h": 1,
-    "L/min": 3,
-    "puls/kWh": 0,
-    "puls": 0,
-    "x": 0,
-    "s": 0,
-    "puls/m³": 0,
-    "€/kWh": 3,
-    "€/m³": 3,
-    "m³/h": 3,
-    "m/s": 1,
-    "W/m²": 0,
-}
-
-TARIFF_LABEL_MAP = {
-    "T1": "Tariff 1",
-    "-T1": "Tariff 1 (Returned)",
-    "T2": "Tariff 2",
-    "-T2": "Tariff 2 (Returned)",
-    "€ T1": "Cost Tariff 1",
-    "€ -T1": "Cost Tariff 1 (Returned)",
-    "€ T2": "Cost Tariff 2",
-    "€ -T2": "Cost Tariff 2 (Returned)",
-    "€ Gas": "Cost Gas",
-    "Pulses / kW·h": "Pulses/kWh",
-}
-
-
-def _has_euro_unit(unit: str | None) -> bool:
-    """Return True when the unit represents a euro-denominated value."""
-    if not unit:
-        return False
-
-    euro_tokens = ("€/", "¤/", "â‚¬/", "EUR/")
-    return any(token in unit for token in euro_tokens)
+# (metric, name, unit, device class, icon) of the poll metric sensors
+POLL_METRIC_SENSORS = (
+    ("fetch_ms", "Poll Fetch Time", UnitOfTime.MILLISECONDS,
+     SensorDeviceClass.DURATION, "mdi:timer-outline"),
+    ("payload_bytes", "Poll Payload Size", UnitOfInformation.BYTES,
+     SensorDeviceClass.DATA_SIZE, "mdi:download-network-outline"),
+    ("parse_ms", "Poll Parse Time", UnitOfTime.MILLISECONDS,
+     SensorDeviceClass.DURATION, "mdi:code-json"),
+    ("box_ms", "Hub Processing Time", UnitOfTime.MILLISECONDS,
+     SensorDeviceClass.DURATION, "mdi:chip"),
+    ("changed_values", "Poll Changed Values", None,
+     None, "mdi:delta"),
+    ("entity_update_ms", "Entity Update Time", UnitOfTime.MILLISECONDS,
+     SensorDeviceClass.DURATION, "mdi:update"),
+    ("queue_lag_ms", "Poll Queue Lag", UnitOfTime.MILLISECONDS,
+     SensorDeviceClass.DURATION, "mdi:timer-sand"),
+)
 
 
 class IungoSensor(CoordinatorEntity, SensorEntity):
     """Representation of an Iungo sensor."""
 
+    # Sample summaries change every poll and are only of interest live
+    _unrecorded_attributes = frozenset({"min", "max", "mean", "samples"})
+
     def __init__(
         self,
         coordinator,
-        unique_id,
-        name,
-        unit,
-        object_id,
+        descriptor: SensorDescriptor,
         object_name,
-        object_type,
-        prop_id,
         entry_id,
     ):
-        super().__init__(coordinator)
-        self._unique_id = unique_id
-        self._unit = unit
-        self._object_id = object_id
+        # Only updated when a value of its object changed
+        super().__init__(coordinator, context=descriptor.object_id)
+        self._descriptor = descriptor
+        self._unit = descriptor.unit
+        self._object_id = descriptor.object_id
         self._object_name = object_name
-        self._object_type = object_type
-        self._prop_id = prop_id
+        self._object_type = descriptor.object_type
+        self._prop_id = descriptor.prop_id
         self._entry_id = entry_id
-        # Default mapping
-        self._device_class = DEVICE_CLASS_MAP.get(unit)
-        # Override for water meters
-        if unit == "m³" and object_type == "water":
-            self._device_class = SensorDeviceClass.WATER
-        self._state_class = STATE_CLASS_MAP.get(unit)
-        self._attr_name = name
-        self._attr_unique_id = unique_id
+        # Coordinator values this sensor's state is derived from
+        self._value_keys = frozenset({descriptor.key})
+        self._slot = coordinator.async_value_slot(descriptor.key)
+        self._written_available = None
+        # Whether the last written state had sample summary attributes
+        self._written_stats = False
+        self._device_class = descriptor.device_class
+        self._state_class = descriptor.state_class
+        self._attr_name = descriptor.name
+        self._attr_unique_id = f"{descriptor.object_id}_{descriptor.prop_id}"
         self._attr_has_entity_name = True
-        self._attr_suggested_display_precision = DISPLAY_PRECISION_MAP.get(
-            unit, 2)
-        if _has_euro_unit(unit):
-            self._attr_icon = "mdi:currency-eur"
+        self._attr_suggested_display_precision = descriptor.display_precision
+        if descriptor.icon:
+            self._attr_icon = descriptor.icon
+
+    async def async_added_to_hass(self) -> None:
+        """Register the values this sensor reads with the coordinator."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_register_value_keys(self._value_keys))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when one of our values or summaries changed."""
+        changed_keys = self.coordinator.changed_keys
+        available = self.available
+        sampled = self._descriptor.key in self.coordinator.history_stats
+        if (
+            changed_keys is not None
+            and available == self._written_available
+            and self._descriptor.key not in changed_keys
+            and not sampled
+            and not self._written_stats
+        ):
+            return
+        self._written_available = available
+        self._written_stats = sampled
+        super()._handle_coordinator_update()
 
     @property
     def native_unit_of_measurement(self):
@@ -169,163 +133,111 @@ class IungoSensor(CoordinatorEntity, SensorEntity):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        object_values = self.coordinator.data.get("object_values", {})
-        value = object_values.get(self._object_id, {}).get(self._prop_id)
-        if isinstance(value, str):
-            try:
-                return float(value)
-            except ValueError:
-                return value
-        return value
-
-
-class IungoBreakoutEnergySensor(IungoSensor):
-    """Special sensor for calculated energy from breakout device."""
-
-    def __init__(self, coordinator, object_id, object_name, entry_id):
-        unique_id = f"{object_id}_calculated_energy"
-        name = "Calculated Energy"
-        super().__init__(
-            coordinator,
-            unique_id,
-            name,
-            "kWh",
-            object_id,
-            object_name,
-            "breakout",
-            "calculated_energy",
-            entry_id,
-        )
-        self._attr_has_entity_name = True
-        self._attr_suggested_display_precision = 3
+        return self.coordinator.values.get(self._slot)
 
     @property
-    def native_value(self):
-        """Return the calculated energy state."""
-        object_values = self.coordinator.data.get("object_values", {})
-        obj = object_values.get(self._object_id, {})
-        try:
-            offset = float(obj.get("offset", 0))
-            totalimport = float(obj.get("pulstotal", 0))
-            pulses = float(obj.get("ppkwh", 1))
-            if pulses == 0:
-                return None
-            return round(offset + totalimport / pulses, 3)
-        except (ValueError, TypeError):
-            return None
+    def extra_state_attributes(self):
+        """Return min, max and mean of the samples since the last poll."""
+        stats = self.coordinator.history_stats.get(self._descriptor.key)
+        return stats.as_dict() if stats is not None else None
 
 
-class IungoBreakoutWaterSensor(IungoSensor):
-    """Special sensor for calculated water from breakout_water device."""
-
-    def __init__(self, coordinator, object_id, object_name, entry_id):
-        unique_id = f"{object_id}_calculated_water"
-        name = "Calculated Water"
-        super().__init__(
-            coordinator,
-            unique_id,
-            name,
-            "m³",
-            object_id,
-            object_name,
-            "breakout_water",
-            "calculated_water",
-            entry_id,
-        )
-        self._device_class = SensorDeviceClass.WATER
-        self._attr_has_entity_name = True
-        self._attr_suggested_display_precision = 3
+class IungoDerivedSensor(IungoSensor):
+    """Sensor showing a metric derived from other values.
+
+    The coordinator computes the metric once per poll; the sensor reads the
+    result. Metrics summing values of several objects belong to the hub.
+    """
+
+    def __init__(self, coordinator, metric: DerivedMetric, object_name, entry_id):
+        super().__init__(coordinator, metric.descriptor, object_name, entry_id)
+        # Values of the box the metric is computed from
+        self._value_keys = frozenset(metric.inputs)
 
     @property
-    def device_class(self):
-        """Return the device class."""
-        return self._device_class
+    def device_info(self):
+        """Return device information for this sensor."""
+        if self._object_id != self._entry_id:
+            return super().device_info
+        return _hub_device_info(self.coordinator.entry)
 
     @property
     def native_value(self):
-        """Return the calculated water state."""
-        object_values = self.coordinator.data.get("object_values", {})
-        obj = object_values.get(self._object_id, {})
-        try:
-            offset = float(obj.get("offset", 0))
-            totalwater = float(obj.get("pulstotal", 0))
-            pulses = float(obj.get("kfact", 1))
-            if pulses == 0:
-                return None
-            return round(offset + totalwater / pulses, 3)
-        except (ValueError, TypeError):
-            return None
-
-
-async def async_setup_entry(
-    hass: HomeAssistant,
-    entry: ConfigEntry,
-    async_add_entities: AddEntitiesCallback
-) -> None:
-    """Set up Iungo sensors based on a config entry."""
-    data_coordinator: IungoDataUpdateCoordinator = entry.runtime_data.data
-    firmware_coordinator: IungoFirmwareUpdateCoordinator = entry.runtime_data.firmware
-    object_info = data_coordinator.data.get("object_info", {})
-    sensor_defs = extract_sensors_from_object_info(object_info)
+        """Return the derived value."""
+        return self.coordinator.derived.get(self._descriptor.key)
+
+
+def _create_object_sensors(
+    coordinator: IungoDataUpdateCoordinator,
+    descriptors,
+    entry_id: str,
+    derived_added: set,
+) -> list:
+    """Create the sensors of the given descriptors and of new derived metrics.
+
+    derived_added holds the keys of the derived metrics that already have a
+    sensor; it is updated with the ones created.
+    """
+    # Data is missing when setup continued from cached object info while
+    # the box was unreachable.
+    object_values = (coordinator.data or {}).get("object_values", {})
     sensors = []
-    object_values = data_coordinator.data.get("object_values", {})
-    breakout_energy_added = False
-    breakout_water_added = False
 
     def _get_friendly_name(obj_id: str, fallback: str) -> str:
         obj_val = object_values.get(obj_id, {})
         return obj_val.get("name") or fallback
 
-    for sensor_def in sensor_defs:
-        unique_id = f"{sensor_def['object_id']}_{sensor_def['prop_id']}"
+    for descriptor in descriptors:
         friendly_name = _get_friendly_name(
-            sensor_def["object_id"], sensor_def["object_name"]
+            descriptor.object_id, descriptor.object_name
         )
-        prop_label = sensor_def['prop_label']
-        name = TARIFF_LABEL_MAP.get(prop_label, prop_label)
-        unit = sensor_def['unit']
 
         sensors.append(
             IungoSensor(
-                data_coordinator,
-                unique_id,
-                name,
-                unit,
-                sensor_def['object_id'],
+                coordinator,
+                descriptor,
                 friendly_name,
-                sensor_def['object_type'],
-                sensor_def['prop_id'],
-                entry.entry_id,
+                entry_id,
             )
         )
 
-        _LOGGER.debug("object_id: %s - %s - %s - %s - %s - %s",
-                      sensor_def['object_id'],
-                      sensor_def["object_type"],
-                      sensor_def["object_name"],
-                      sensor_def["unit"],
-                      sensor_def['prop_id'], sensor_def['unit'])
-
-        if sensor_def["object_name"] == "energy-breakout" and not breakout_energy_added:
-            sensors.append(
-                IungoBreakoutEnergySensor(
-                    data_coordinator,
-                    sensor_def["object_id"],
-                    friendly_name,
-                    entry.entry_id,
-                )
-            )
-            breakout_energy_added = True
-        if sensor_def["object_name"] == "water-breakout" and not breakout_water_added:
-            sensors.append(
-                IungoBreakoutWaterSensor(
-                    data_coordinator,
-                    sensor_def["object_id"],
-                    friendly_name,
-                    entry.entry_id,
-                )
-            )
-            breakout_water_added = True
+        _LOGGER.debug("object_id: %s - %s - %s - %s - %s",
+                      descriptor.object_id,
+                      descriptor.object_type,
+                      descriptor.object_name,
+                      descriptor.unit,
+                      descriptor.prop_id)
+
+    for metric in coordinator.derived.metrics:
+        if metric.key in derived_added:
+            continue
+        object_descriptors = coordinator.schema.objects.get(metric.descriptor.object_id)
+        friendly_name = _get_friendly_name(
+            metric.descriptor.object_id,
+            object_descriptors[0].object_name if object_descriptors
+            else metric.descriptor.object_name,
+        )
+        sensors.append(
+            IungoDerivedSensor(coordinator, metric, friendly_name, entry_id))
+        derived_added.add(metric.key)
+    return sensors
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up Iungo sensors based on a config entry."""
+    data_coordinator: IungoDataUpdateCoordinator = entry.runtime_data.data
+    firmware_coordinator: IungoFirmwareUpdateCoordinator = entry.runtime_data.firmware
+    derived_added = set()
+    sensors = _create_object_sensors(
+        data_coordinator,
+        data_coordinator.schema.descriptors,
+        entry.entry_id,
+        derived_added,
+    )
 
     sensors.append(
         IungoFirmwareVersionSensor(firmware_coordinator, entry.entry_id)
@@ -333,8 +245,43 @@ async def async_setup_entry(
     sensors.append(
         IungoLatestFirmwareVersionSensor(firmware_coordinator, entry.entry_id)
     )
+    sensors.append(IungoLastSampleSensor(data_coordinator, entry.entry_id))
+    sensors.extend(
+        IungoPollMetricSensor(data_coordinator, entry.entry_id, *metric)
+        for metric in POLL_METRIC_SENSORS
+    )
     async_add_entities(sensors)
 
+    @callback
+    def _async_objects_changed(added_descriptors, removed_object_ids) -> None:
+        """Add the sensors of new objects and remove those of deleted ones."""
+        entity_registry = er.async_get(hass)
+        for entity_entry in er.async_entries_for_config_entry(
+            entity_registry, entry.entry_id
+        ):
+            if entity_entry.unique_id.split("_", 1)[0] in removed_object_ids:
+                entity_registry.async_remove(entity_entry.entity_id)
+        device_registry = dr.async_get(hass)
+        for object_id in removed_object_ids:
+            device = device_registry.async_get_device(
+                identifiers={(DOMAIN, object_id)})
+            if device is not None:
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=entry.entry_id)
+        derived_added.difference_update(
+            {key for key in derived_added if key[0] in removed_object_ids})
+        new_sensors = _create_object_sensors(
+            data_coordinator,
+            added_descriptors,
+            entry.entry_id,
+            derived_added,
+        )
+        if new_sensors:
+            async_add_entities(new_sensors)
+
+    entry.async_on_unload(
+        data_coordinator.async_add_objects_listener(_async_objects_changed))
+
 
 class IungoFirmwareVersionSensor(CoordinatorEntity, SensorEntity):
     """Sensor for the current firmware version."""
@@ -361,15 +308,7 @@ class IungoFirmwareVersionSensor(CoordinatorEntity, SensorEntity):
     @property
     def device_info(self):
         """Return device information for this sensor."""
-        return {
-            "identifiers": {(DOMAIN, self._entry_id)},
-            "name": "Iungo Hub",
-            "manufacturer": "Iungo",
-            "model": "Iungo",
-            "configuration_url": _hub_configuration_url(
-                self.coordinator.entry.data.get(CONF_HOST)
-            ),
-        }
+        return _hub_device_info(self.coordinator.entry)
 
 
 class IungoLatestFirmwareVersionSensor(CoordinatorEntity, SensorEntity):
@@ -396,12 +335,85 @@ class IungoLatestFirmwareVersionSensor(CoordinatorEntity, SensorEntity):
     @property
     def device_info(self):
         """Return device information for this sensor."""
+        return _hub_device_info(self.coordinator.entry)
+
+
+class IungoLastSampleSensor(CoordinatorEntity, SensorEntity):
+    """Sensor for when the box sampled the current values, by its own clock."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator: IungoDataUpdateCoordinator, entry_id: str):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._entry_id = entry_id
+        self._attr_name = "Iungo Last Sample"
+        self._attr_unique_id = f"{entry_id}_last_sample"
+        self._attr_icon = "mdi:clock-check-outline"
+
+    @property
+    def native_value(self):
+        """Return the box time of the last values reply."""
+        return self.coordinator.box_systime
+
+    @property
+    def device_info(self):
+        """Return device information for this sensor."""
+        return _hub_device_info(self.coordinator.entry)
+
+
+class IungoPollMetricSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor for one of the data coordinator's poll metrics."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: IungoDataUpdateCoordinator,
+        entry_id: str,
+        metric: str,
+        name: str,
+        unit: str | None,
+        device_class: SensorDeviceClass | None,
+        icon: str,
+    ):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._entry_id = entry_id
+        self._metric = metric
+        self._attr_name = f"Iungo {name}"
+        self._attr_unique_id = f"{entry_id}_poll_{metric}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_icon = icon
+        if unit == UnitOfTime.MILLISECONDS:
+            self._attr_suggested_display_precision = 1
+
+    @property
+    def _stats(self):
+        """Return the rolling stats of the metric."""
+        return getattr(self.coordinator.metrics, self._metric)
+
+    @property
+    def native_value(self):
+        """Return the metric of the last poll."""
+        return self._stats.last
+
+    @property
+    def extra_state_attributes(self):
+        """Return the rolling percentiles of the metric."""
+        stats = self._stats.as_dict()
         return {
-            "identifiers": {(DOMAIN, self._entry_id)},
-            "name": "Iungo Hub",
-            "manufacturer": "Iungo",
-            "model": "Iungo",
-            "configuration_url": _hub_configuration_url(
-                self.coordinator.entry.data.get(CONF_HOST)
-            ),
+            "median": stats["p50"],
+            "p95": stats["p95"],
+            "max": stats["max"],
+            "samples": stats["samples"],
         }
+
+    @property
+    def device_info(self):
+        """Return device information for this sensor."""
+        return _hub_device_info(self.coordinator.entry)
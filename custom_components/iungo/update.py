@@ -7,8 +7,7 @@ from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from . import _hub_configuration_url
-from .const import CONF_HOST, DOMAIN
+from . import _hub_device_info
 from .coordinator import IungoFirmwareUpdateCoordinator
 
 
@@ -77,13 +76,7 @@ class IungoUpdateEntity(CoordinatorEntity, UpdateEntity):
         hardware = hwinfo.get("hardware", {})
 
         return DeviceInfo(
-            identifiers={(DOMAIN, self.coordinator.entry.entry_id)},
-            name="Iungo Hub",
-            manufacturer="Iungo",
-            model="Iungo",
-            configuration_url=_hub_configuration_url(
-                self.coordinator.entry.data.get(CONF_HOST)
-            ),
+            **_hub_device_info(self.coordinator.entry),
             hw_version=hardware.get("revision", ""),
             sw_version=f"{sw_version} build {build}".strip(),
             serial_number=serial_number,
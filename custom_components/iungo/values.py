@@ -0,0 +1,131 @@
+"""Compact store of the values read by Iungo entities."""
+
+from array import array
+from collections.abc import Iterable, Mapping
+
+# Kind of the value held in a slot
+_MISSING = 0
+_FLOAT = 1
+_INT = 2
+_OTHER = 3
+
+# How the values of a slot are coerced, from the declared property type
+_AS_ANY = 0
+_AS_NUMBER = 1
+_AS_TEXT = 2
+
+# Larger ints do not survive the round trip through a float
+_MAX_EXACT_INT = 2 ** 53
+
+
+class ValueStore:
+    """Latest values of (object_id, prop_id) pairs, kept in fixed slots.
+
+    Every pair gets a slot once, when the schema is compiled or an entity
+    asks for it. Numbers live in a preallocated array of floats with their
+    kind in a parallel byte array; other values go to a small side table.
+    Each poll overwrites the slots in place, so entities only keep a slot
+    index and reading a value is two array lookups.
+
+    Values are coerced once per poll by the property type declared in
+    object_info: numeric strings of "number" properties become floats and
+    other strings are missing, text properties are kept as sent. Slots
+    without a declared type convert strings that parse as a number and
+    keep other strings.
+    """
+
+    def __init__(self) -> None:
+        self._slots: dict[tuple[str, str], int] = {}
+        self._numbers = array("d")
+        self._kinds = array("B")
+        self._coercions = array("B")
+        self._others: dict[int, object] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._slots
+
+    def slot(self, key: tuple[str, str], value_type: str | None = None) -> int:
+        """Return the slot of a pair, assigning a new one when needed.
+
+        value_type is the property type declared in object_info, if known.
+        """
+        if value_type is None:
+            coercion = _AS_ANY
+        elif value_type == "number":
+            coercion = _AS_NUMBER
+        else:
+            coercion = _AS_TEXT
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = len(self._numbers)
+            self._numbers.append(0.0)
+            self._kinds.append(_MISSING)
+            self._coercions.append(coercion)
+        elif coercion != _AS_ANY:
+            self._coercions[slot] = coercion
+        return slot
+
+    def add_keys(
+        self,
+        keys: Iterable[tuple[str, str]],
+        value_types: Mapping[tuple[str, str], str] | None = None,
+    ) -> None:
+        """Assign slots to pairs that do not have one yet."""
+        for key in keys:
+            self.slot(key, value_types.get(key) if value_types else None)
+
+    def get(self, slot: int):
+        """Return the value in a slot, None when the box did not send it."""
+        kind = self._kinds[slot]
+        if kind == _FLOAT:
+            return self._numbers[slot]
+        if kind == _INT:
+            return int(self._numbers[slot])
+        if kind == _OTHER:
+            return self._others[slot]
+        return None
+
+    def update(self, object_values: dict, changed_keys=None) -> None:
+        """Overwrite slots from a {object_id: {prop_id: value}} lookup.
+
+        With changed_keys only the slots of those pairs are rewritten,
+        otherwise every slot is.
+        """
+        if changed_keys is None:
+            items = self._slots.items()
+        else:
+            slots = self._slots
+            items = [(key, slots[key]) for key in changed_keys if key in slots]
+        numbers = self._numbers
+        kinds = self._kinds
+        coercions = self._coercions
+        others = self._others
+        for (oid, prop_id), slot in items:
+            value = object_values.get(oid, {}).get(prop_id)
+            coercion = coercions[slot]
+            if value is None:
+                kind = _MISSING
+            elif coercion == _AS_TEXT:
+                kind = _OTHER
+            elif type(value) is float:
+                kind = _FLOAT
+            elif type(value) is int and -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT:
+                kind = _INT
+            elif isinstance(value, str):
+                try:
+                    value = float(value)
+                    kind = _FLOAT
+                except ValueError:
+                    kind = _MISSING if coercion == _AS_NUMBER else _OTHER
+            else:
+                kind = _OTHER
+            if kind == _OTHER:
+                others[slot] = value
+            else:
+                numbers[slot] = value if kind != _MISSING else 0.0
+                if kinds[slot] == _OTHER:
+                    del others[slot]
+            kinds[slot] = kind
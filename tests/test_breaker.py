@@ -0,0 +1,43 @@
+"""Tests of the circuit breaker of the Iungo client."""
+
+import asyncio
+
+import pytest
+
+from benchmarks.fake_iungo import FakeIungo
+from custom_components.iungo import iungo
+from custom_components.iungo.const import BREAKER_FAILURE_THRESHOLD
+from custom_components.iungo.iungo import CannotConnect, IungoClient
+
+
+async def _trip_and_recover() -> None:
+    box = FakeIungo(seed=1)
+    host = await box.start()
+    client = IungoClient(host)
+    try:
+        box.error_rate = 1.0
+        for _ in range(BREAKER_FAILURE_THRESHOLD):
+            with pytest.raises(CannotConnect):
+                await client.async_get_sysinfo()
+        assert client.circuit_open
+
+        # Open: requests fail without reaching the box
+        requests = box.requests
+        with pytest.raises(CannotConnect):
+            await client.async_get_sysinfo()
+        assert box.requests == requests
+
+        # After the back-off the probe closes the circuit again
+        box.error_rate = 0.0
+        await asyncio.sleep(0.1)
+        assert await client.async_get_object_info()
+        assert not client.circuit_open
+    finally:
+        await client.async_close()
+        await box.stop()
+
+
+def test_breaker_recovers_after_backoff(monkeypatch):
+    """The breaker opens on failures and closes once the box answers."""
+    monkeypatch.setattr(iungo, "BREAKER_MIN_BACKOFF", 0.05)
+    asyncio.run(_trip_and_recover())
@@ -0,0 +1,41 @@
+"""Tests of the values digest used to skip unchanged polls."""
+
+import copy
+import json
+from pathlib import Path
+
+from custom_components.iungo.iungo import ObjectValuesStreamParser
+
+VALUES = json.loads(
+    (Path(__file__).parent.parent / "custom_components" / "values.json").read_text())
+
+
+def _digest(reply: dict) -> str:
+    parser = ObjectValuesStreamParser()
+    body = json.dumps(reply).encode()
+    for start in range(0, len(body), 512):
+        parser.feed(body[start:start + 512])
+    parser.close()
+    return parser.digest
+
+
+def _set_prop(reply: dict, prop_id: str, value) -> dict:
+    reply = copy.deepcopy(reply)
+    for obj in reply["rv"]["objects"]:
+        for prop in obj["propsval"]:
+            if prop["id"] == prop_id:
+                prop["value"] = value
+                return reply
+    raise KeyError(prop_id)
+
+
+def test_volatile_props_do_not_change_digest():
+    """Only the clock and link counters moved: the digest is the same."""
+    moved = _set_prop(_set_prop(VALUES, "bytes_rx", 74280000), "time", "11:40")
+    moved["seq"] = moved.get("seq", 0) + 1
+    assert _digest(moved) == _digest(VALUES)
+
+
+def test_reading_changes_digest():
+    """A changed reading changes the digest."""
+    assert _digest(_set_prop(VALUES, "usage", 501)) != _digest(VALUES)
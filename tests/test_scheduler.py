@@ -0,0 +1,40 @@
+"""Tests of the data poll scheduler and the refresh phase lock."""
+
+from custom_components.iungo.scheduler import AdaptivePollScheduler, RefreshPhaseLock
+
+
+def _run(refresh: float, polls: int, refresh_period=None):
+    """Poll an object refreshed every refresh seconds, return the last state."""
+    scheduler = AdaptivePollScheduler(10, 300, 30, 900)
+    lock = RefreshPhaseLock()
+    now, seen, interval = 100.0, None, 30.0
+    for _ in range(polls):
+        count = int((now - 3.3) // refresh)
+        changed = None if seen is None else ({"meter"} if count != seen else set())
+        seen = count
+        scheduler.record_poll(
+            changed, ["meter"], now=now, refresh_period=refresh_period)
+        lock.record_poll(None if changed is None else bool(changed), now)
+        interval = lock.next_interval(scheduler.interval, scheduler.min_interval, now)
+        now += interval
+    return scheduler, lock, interval
+
+
+def test_change_on_every_poll_keeps_interval():
+    """Changes seen on every poll do not shrink the interval."""
+    scheduler, _, _ = _run(1.0, 20)
+    assert scheduler.interval == 30
+
+
+def test_known_refresh_period_lowers_interval():
+    """A measured refresh period lets such objects poll faster."""
+    scheduler, _, _ = _run(1.0, 20, refresh_period=12.0)
+    assert scheduler.interval == 12
+
+
+def test_slow_refresh_locks_without_fast_polls():
+    """A refresh slower than the interval is locked on at that interval."""
+    _, lock, interval = _run(120.0, 60)
+    assert lock.locked
+    assert abs(lock.period - 120) < 12
+    assert interval >= 10
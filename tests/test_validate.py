@@ -0,0 +1,49 @@
+"""Tests of validating the connection to a Iungo box."""
+
+import asyncio
+
+from aiohttp import web
+import pytest
+
+from benchmarks.fake_iungo import FakeIungo
+from custom_components.iungo.iungo import IungoClient, async_validate_connection
+
+
+async def _validate_other_server(status: int) -> bool:
+    async def handle(request: web.Request) -> web.Response:
+        return web.Response(status=status, text="Not here")
+
+    app = web.Application()
+    app.router.add_get("/{path:.*}", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    client = IungoClient(f"127.0.0.1:{port}")
+    try:
+        return await async_validate_connection(client)
+    finally:
+        await client.async_close()
+        await runner.cleanup()
+
+
+async def _validate_box() -> bool:
+    box = FakeIungo(seed=1)
+    client = IungoClient(await box.start())
+    try:
+        return await async_validate_connection(client)
+    finally:
+        await client.async_close()
+        await box.stop()
+
+
+@pytest.mark.parametrize("status", [200, 400, 404, 501])
+def test_other_web_server_cannot_connect(status):
+    """A host that is not a Iungo box fails validation without raising."""
+    assert asyncio.run(_validate_other_server(status)) is False
+
+
+def test_box_validates():
+    """The fake box passes validation."""
+    assert asyncio.run(_validate_box()) is True